@@ -0,0 +1,235 @@
+"""
+Assignment throughput benchmark
+
+Reproduces the "Practical speedup" claim in the tex writeup by timing seven
+ways of computing the same assignment on CPU:
+
+  naive   per-point loop over ‖x − c_i‖² (runtime clustering)
+  gemm    expanded distance ‖x‖² − 2⟨x, c⟩ + ‖c‖² as one matmul + argmin
+  biased  single matmul with precomputed bias −½‖c‖² + argmax (exact for
+          non-normalized centroids)
+  sae     single matmul ReLU(Wx) + argmax (SAE top-1)
+  sharded SAE top-1 split over a thread pool (--workers)
+  topk    TopK SAE via argpartition (--top-k); agreement uses its top-1
+  blocked L2-tiled expanded distance with direct recompute of near-ties
+
+Usage:
+    python benchmarks/bench_assign.py --n 4096 65536 --k 64 1024 --d 128 768 \\
+        --dtype float32 --out bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sae_kmeans import (
+    CentroidEncoder, ShardedAssigner, blocked_nearest, kmeans_assign, normalize, sae_top1,
+    sae_topk,
+)
+
+SCHEMA_VERSION = 1
+
+
+# === IMPLEMENTATIONS UNDER TEST ===
+# Each method takes the centroid matrix once ("load time", untimed) and
+# returns the per-batch assignment function that is timed.
+
+def naive_method(centroids):
+    """Runtime clustering: one distance scan per point"""
+    def run(x):
+        out = np.empty(x.shape[0], dtype=np.int64)
+        for n in range(x.shape[0]):
+            diff = centroids - x[n]
+            out[n] = np.einsum("kd,kd->k", diff, diff).argmin()
+        return out
+    return run
+
+
+def gemm_method(centroids):
+    return lambda x: kmeans_assign(x, centroids)
+
+
+def biased_method(centroids):
+    encoder = CentroidEncoder(centroids)
+    return encoder.assign
+
+
+def sae_method(centroids):
+    return lambda x: sae_top1(x, centroids)[0]
+
+
+def sharded_method(centroids, workers=None):
+    assigner = ShardedAssigner(CentroidEncoder(centroids), workers=workers)
+    fn = lambda x: assigner(x)[0]
+    # run_case shuts the pool down once the case is measured
+    fn.close = assigner.close
+    return fn
+
+
+def topk_method(centroids, top_k=8):
+    top_k = min(top_k, len(centroids))
+    return lambda x: sae_topk(x, centroids, top_k)[0][:, 0]
+
+
+def blocked_method(centroids):
+    return lambda x: blocked_nearest(x, centroids)[0]
+
+
+METHODS = {
+    "naive": naive_method,
+    "gemm": gemm_method,
+    "biased": biased_method,
+    "sae": sae_method,
+    "sharded": sharded_method,
+    "topk": topk_method,
+    "blocked": blocked_method,
+}
+
+
+# === MEASUREMENT ===
+
+def make_problem(n, k, d, dtype, seed, raw_centroids=False):
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((k, d))
+    if not raw_centroids:
+        centroids = normalize(centroids)
+    centroids = centroids.astype(dtype)
+    x = rng.standard_normal((n, d)).astype(dtype)
+    return x, centroids
+
+
+def measure(fn, x, repeats, warmup):
+    """Time repeated calls and trace peak allocation of one extra call"""
+    for _ in range(warmup):
+        fn(x)
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(x)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+
+    tracemalloc.start()
+    fn(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = float(np.median(latencies))
+    return {
+        "n": int(x.shape[0]),
+        "throughput_vps": x.shape[0] / median if median > 0 else float("inf"),
+        "latency_s": {
+            "mean": float(latencies.mean()),
+            "p50": median,
+            "p90": float(np.percentile(latencies, 90)),
+            "p99": float(np.percentile(latencies, 99)),
+            "min": float(latencies.min()),
+        },
+        "peak_bytes": int(peak),
+    }
+
+
+def run_case(n, k, d, dtype, methods, repeats, warmup, naive_max_n, seed,
+             raw_centroids=False, options=None):
+    options = options or {}
+    x, centroids = make_problem(n, k, d, dtype, seed, raw_centroids)
+    reference = kmeans_assign(x, centroids)
+    case = {"n": n, "k": k, "d": d, "dtype": np.dtype(dtype).name, "methods": {}}
+
+    for name in methods:
+        fn = METHODS[name](centroids, **options.get(name, {}))
+        try:
+            # The naive loop is timed on a prefix and reported as vectors/s
+            xs = x[:naive_max_n] if name == "naive" else x
+            result = measure(fn, xs, repeats, warmup)
+
+            # Fraction of rows matching the k-means assignment
+            labels = fn(xs)
+        finally:
+            if hasattr(fn, "close"):
+                fn.close()
+        result["agreement"] = float((labels == reference[: len(labels)]).mean())
+        case["methods"][name] = result
+
+    if "naive" in case["methods"]:
+        base = case["methods"]["naive"]["throughput_vps"]
+        for result in case["methods"].values():
+            result["speedup_vs_naive"] = result["throughput_vps"] / base
+    return case
+
+
+def environment():
+    try:
+        blas = np.show_config(mode="dicts").get("Build Dependencies", {}).get("blas", {})
+    except TypeError:
+        blas = {}
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "blas": blas.get("name"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, nargs="+", default=[4096, 65536])
+    parser.add_argument("--k", type=int, nargs="+", default=[64, 1024])
+    parser.add_argument("--d", type=int, nargs="+", default=[128, 768])
+    parser.add_argument("--dtype", nargs="+", default=["float32"],
+                        choices=["float16", "float32", "float64"])
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--naive-max-n", type=int, default=2048,
+                        help="rows timed for the per-point loop")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="thread count for 'sharded' (default: all cores)")
+    parser.add_argument("--top-k", type=int, default=8, help="latents kept per row for 'topk'")
+    parser.add_argument("--raw-centroids", action="store_true",
+                        help="skip unit-norm projection (sae then disagrees with k-means)")
+    parser.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    cases = []
+    for n, k, d, dtype in product(args.n, args.k, args.d, args.dtype):
+        case = run_case(n, k, d, dtype, args.methods, args.repeats,
+                        args.warmup, args.naive_max_n, args.seed, args.raw_centroids,
+                        options={"sharded": {"workers": args.workers},
+                                 "topk": {"top_k": args.top_k}})
+        cases.append(case)
+        summary = ", ".join(
+            f"{name} {r['throughput_vps']:.3g} v/s" for name, r in case["methods"].items()
+        )
+        print(f"N={n} k={k} d={d} {case['dtype']}: {summary}", file=sys.stderr)
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "benchmark": "assign",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "cases": cases,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
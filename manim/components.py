@@ -0,0 +1,207 @@
+"""
+Shared, data-driven scene components
+
+Every builder takes plain data (centroid arrays, query points, activations)
+and returns a fresh mobject, so scenes and configurations differ only in
+the data they pass. Compiled TeX is shared across scenes by texcache.py.
+"""
+
+from collections import namedtuple
+
+from manim import *
+import numpy as np
+
+# === COLOR PALETTE (white bg, greyscale + blue/orange accents) ===
+BACKGROUND = "#ffffff"
+TEXT_PRIMARY = "#1a1a1a"
+TEXT_SECONDARY = "#666666"
+
+BLUE = "#165A95"
+ORANGE = "#ea580c"
+GREY_DARK = "#404040"
+GREY_MID = "#808080"
+GREY_LIGHT = "#b3b3b3"
+
+# Centroid colors (blue primary, grey for others)
+C1_COLOR = BLUE
+C2_COLOR = GREY_MID
+C3_COLOR = GREY_LIGHT
+
+# Point color (orange accent)
+POINT_COLOR = ORANGE
+
+
+# === BUILDERS ===
+
+# Plot geometry: half-width of the data range, side length on screen,
+# axis stroke opacity and where the plot's origin sits on screen
+AxesSpec = namedtuple("AxesSpec", "extent length stroke_opacity shift")
+
+
+def math_tex(tex, font_size, color=TEXT_PRIMARY):
+    return MathTex(tex, font_size=font_size, color=color)
+
+
+def axes(spec):
+    """Subtle square axes without tips"""
+    ax = Axes(
+        x_range=[-spec.extent, spec.extent, 1],
+        y_range=[-spec.extent, spec.extent, 1],
+        x_length=spec.length,
+        y_length=spec.length,
+        tips=False,
+        axis_config={
+            "stroke_color": TEXT_SECONDARY,
+            "stroke_opacity": spec.stroke_opacity,
+            "stroke_width": 1,
+        }
+    )
+    ax.shift(np.array(spec.shift))
+    return ax
+
+
+def _c2p(spec, point):
+    # axes(spec) is linear with equal scales and centered on spec.shift
+    scale = spec.length / (2 * spec.extent)
+    return np.array([point[0] * scale, point[1] * scale, 0]) + np.array(spec.shift)
+
+
+def unit_circle(spec):
+    circle = Circle(radius=spec.length / (2 * spec.extent), color=TEXT_SECONDARY, stroke_opacity=0.2)
+    circle.move_to(_c2p(spec, (0, 0)))
+    return circle
+
+
+def centroid_markers(spec, centroids, colors, label_dirs, radius, font_size, label_buff,
+                     glow_radius=None):
+    """VGroup(markers, labels): one (glow, dot) or dot per centroid plus c_i labels"""
+    markers = VGroup()
+    labels = VGroup()
+    for i, (pos, col, ldir) in enumerate(zip(centroids, colors, label_dirs)):
+        center = _c2p(spec, pos)
+        dot = Dot(center, radius=radius, color=col, fill_opacity=1)
+        if glow_radius is not None:
+            glow = Dot(center, radius=glow_radius, color=col, fill_opacity=0.3)
+            markers.add(VGroup(glow, dot))
+        else:
+            markers.add(dot)
+
+        label = math_tex(f"c_{{{i + 1}}}", font_size, col)
+        label.next_to(dot, ldir, buff=label_buff)
+        labels.add(label)
+    return VGroup(markers, labels)
+
+
+def query_marker(spec, point, radius, font_size, label_buff, glow_radius=None):
+    """VGroup(marker, label) for the query point x"""
+    center = _c2p(spec, point)
+    dot = Dot(center, radius=radius, color=POINT_COLOR)
+    marker = dot
+    if glow_radius is not None:
+        glow = Dot(center, radius=glow_radius, color=POINT_COLOR, fill_opacity=0.3)
+        marker = VGroup(glow, dot)
+    label = math_tex("x", font_size, POINT_COLOR)
+    label.next_to(dot, UR, buff=label_buff)
+    return VGroup(marker, label)
+
+
+def distance_lines(spec, point, centroids, colors):
+    """Dashed x -> c_i lines"""
+    return VGroup(*[
+        DashedLine(
+            _c2p(spec, point),
+            _c2p(spec, pos),
+            color=col,
+            stroke_opacity=0.5,
+            stroke_width=2,
+            dash_length=0.08
+        )
+        for pos, col in zip(centroids, colors)
+    ])
+
+
+def activation_bars(values, colors, first_center, bottom, width, spacing, scale=1.5,
+                    fill_opacity=0.7, zero_height=None):
+    """Bottom-aligned activation bars; zeros drawn as flat grey stubs if zero_height"""
+    bars = VGroup()
+    for i, (val, col) in enumerate(zip(values, colors)):
+        if val > 0 or zero_height is None:
+            bar = Rectangle(width=width, height=val * scale, color=col,
+                            fill_opacity=fill_opacity, stroke_width=1)
+        else:
+            bar = Rectangle(width=width, height=zero_height, color=TEXT_SECONDARY,
+                            fill_opacity=0.3, stroke_width=1)
+        bar.move_to(np.array([first_center + i * spacing, bottom, 0]), aligned_edge=DOWN)
+        bars.add(bar)
+    return bars
+
+
+def encoder_pipeline(x_center, w_center, relu_center):
+    """x -> W -> ReLU boxes and arrows:
+    VGroup(x_box, x_label, arrow1, w_box, w_label, arrow2, relu_box, relu_label)"""
+    x_box = Rectangle(width=0.6, height=1.8, color=POINT_COLOR, fill_opacity=0.15, stroke_width=2)
+    x_box.shift(RIGHT * x_center)
+    x_label = math_tex("x", 28, POINT_COLOR)
+    x_label.next_to(x_box, DOWN, buff=0.2)
+
+    w_box = Rectangle(width=1.8, height=1.8, color=TEXT_PRIMARY, fill_opacity=0.1,
+                      stroke_width=2, stroke_opacity=0.8)
+    w_box.shift(RIGHT * w_center)
+    w_label = math_tex("W", 28, TEXT_PRIMARY)
+    w_label.move_to(w_box)
+
+    relu_box = Rectangle(width=1.2, height=1.2, color=ORANGE, fill_opacity=0.15, stroke_width=2)
+    relu_box.shift(RIGHT * relu_center)
+    relu_label = Text("ReLU", font_size=20, color=ORANGE)
+    relu_label.move_to(relu_box)
+
+    arrow1 = pipeline_arrow(x_box.get_right(), w_box.get_left())
+    arrow2 = pipeline_arrow(w_box.get_right(), relu_box.get_left())
+    return VGroup(x_box, x_label, arrow1, w_box, w_label, arrow2, relu_box, relu_label)
+
+
+def screen_points(spec, points):
+    """Vectorized c2p for an (n, 2) array: the axes are linear with equal scales"""
+    points = np.asarray(points, dtype=np.float64)
+    origin = _c2p(spec, (0, 0))
+    scale = spec.length / (2 * spec.extent)
+    out = np.zeros((len(points), 3))
+    out[:, :2] = points * scale
+    return out + origin
+
+
+def point_cloud(spec, points, labels, palette, stroke_width=2, opacity=0.6):
+    """One PMobject for all points, colored palette[label]; label -1 is drawn grey
+
+    Positions and colors are plain (n, 3) / (n, 4) arrays, so cost scales
+    with the number of pixels touched rather than Python objects.
+    """
+    palette_rgba = np.array([color_to_rgba(c, opacity) for c in list(palette) + [GREY_LIGHT]])
+    cloud = PMobject(stroke_width=stroke_width)
+    cloud.add_points(screen_points(spec, points), rgbas=palette_rgba[np.asarray(labels)])
+    return cloud
+
+
+def pixel_grid(spec, resolution):
+    """(resolution², 2) data coordinates of pixel centers, top row first"""
+    step = 2 * spec.extent / resolution
+    ticks = -spec.extent + step * (np.arange(resolution) + 0.5)
+    xs, ys = np.meshgrid(ticks, ticks[::-1])
+    return np.column_stack([xs.ravel(), ys.ravel()])
+
+
+def region_image(spec, labels, palette, opacity=0.35):
+    """Image of an assignment map: labels is the (res, res) argmax over pixel_grid"""
+    palette_rgba = np.array([color_to_int_rgba(c, opacity) for c in palette], dtype=np.uint8)
+    image = ImageMobject(palette_rgba[np.asarray(labels)])
+    image.set_height(spec.length)
+    image.move_to(_c2p(spec, (0, 0)))
+    return image
+
+
+def pipeline_arrow(start, end):
+    return Arrow(
+        start, end,
+        buff=0.15, color=TEXT_SECONDARY, stroke_width=2,
+        max_tip_length_to_length_ratio=0.15
+    )
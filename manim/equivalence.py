@@ -2,39 +2,145 @@
 SAE ≡ K-Means Equivalence Visualization
 """
 
+import sys
+from pathlib import Path
+
 from manim import *
 import numpy as np
 
-# === COLOR PALETTE (white bg, greyscale + blue/orange accents) ===
-BACKGROUND = "#ffffff"
-TEXT_PRIMARY = "#1a1a1a"
-TEXT_SECONDARY = "#666666"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sae_kmeans import assign, kmeans_assign, lloyd_history, normalize, sae_encode
+
+from components import (
+    BACKGROUND, BLUE, C1_COLOR, C2_COLOR, C3_COLOR, GREY_LIGHT, GREY_MID, ORANGE, POINT_COLOR,
+    TEXT_PRIMARY, TEXT_SECONDARY,
+    AxesSpec, activation_bars, axes, centroid_markers, distance_lines, encoder_pipeline,
+    math_tex, pipeline_arrow, pixel_grid, point_cloud, query_marker, region_image,
+    screen_points, unit_circle,
+)
+import texcache
+from profiling import ProfiledScene
+from streaming import StreamedScene
+
+# Compiled TeX is shared across scenes and parallel renders
+texcache.install()
+
+# === DEMO DATA (drawn from the assignment engine, not hand-typed) ===
+# Centroids (normalized, on unit circle): right, upper left, lower left
+CENTROIDS = normalize([
+    (1, 0),
+    (-0.5, 0.866),
+    (-0.5, -0.866),
+])
+CENTROID_COLORS = [C1_COLOR, C2_COLOR, C3_COLOR]
+CENTROID_LABEL_DIRS = [RIGHT, UL, DL]
+
+# Query points for the large k-means plot and the small equivalence plot
+X_POS = np.array([0.5, 0.4])
+X_POS_SMALL = np.array([0.4, 0.3])
+
+# Plot geometry: data half-width, screen size, axis opacity, origin offset
+KMEANS_AXES = AxesSpec(2.5, 5, 0.3, (-2.5, 0, 0))
+KMEANS_AXES_README = AxesSpec(2.5, 5, 0.3, (0, 0, 0))
+EQUIV_AXES = AxesSpec(1.5, 2.5, 0.2, (-3.5, -0.3, 0))
+EQUIV_AXES_README = AxesSpec(1.5, 2.5, 0.2, (-3.5, 0, 0))
+CLOUD_AXES = AxesSpec(2.5, 6.5, 0.3, (0, -0.3, 0))
+VORONOI_AXES = AxesSpec(2.0, 6.5, 0.3, (0, -0.3, 0))
+LLOYD_AXES = AxesSpec(2.5, 6.5, 0.3, (0, -0.3, 0))
+
+
+def demo_assignment(centroids, query):
+    """(winner, bar heights) for one query, computed by the engine
+
+    Bars are ReLU(Wx) scaled so the winning bar is 0.9 tall (minimum 0.08).
+    """
+    kmeans_idx, sae_idx, _ = assign(query, centroids)
+    winner = int(sae_idx[0])
+    assert winner == kmeans_idx[0], "demo data violates the proven equivalence"
+    z = sae_encode(query, centroids)[0]
+    assert z.max() > 0, "demo query violates h_pos (every activation is zero)"
+    return winner, np.maximum(0.9 * z / z.max(), 0.08)
+
+
+def ring_centroids(k, seed=0):
+    """k normalized centroids spread around the unit circle with jittered angles"""
+    rng = np.random.default_rng(seed)
+    angles = 2 * np.pi * (np.arange(k) + rng.uniform(-0.2, 0.2, k)) / k
+    return normalize(np.column_stack([np.cos(angles), np.sin(angles)]))
+
+
+def sample_cloud(centroids, n, seed=0, spread=0.15):
+    """n points scattered along the rays through each centroid"""
+    rng = np.random.default_rng(seed)
+    member = rng.integers(len(centroids), size=n)
+    radius = rng.uniform(0.2, 2.0, size=(n, 1))
+    return centroids[member] * radius + rng.normal(scale=spread, size=(n, 2))
+
+
+def sample_blobs(centers, n, seed=0, spread=0.35):
+    """n points from isotropic Gaussian blobs around centers"""
+    rng = np.random.default_rng(seed)
+    centers = np.asarray(centers, dtype=np.float64)
+    member = rng.integers(len(centers), size=n)
+    return centers[member] + rng.normal(scale=spread, size=(n, 2))
+
+
+class DemoScene(StreamedScene, ProfiledScene, Scene):
+    """Scene driven by class-level demo data
+
+    Subclass (or use `configure`) to render other centroid sets or queries;
+    winners and activations are recomputed from the data.
+    """
+    centroids = CENTROIDS
+    query = X_POS
+    query_small = X_POS_SMALL
+    centroid_colors = CENTROID_COLORS
+    label_dirs = CENTROID_LABEL_DIRS
+
+    def setup(self):
+        super().setup()
+        self.camera.background_color = BACKGROUND
+        k = len(self.centroids)
+        self.colors = (list(self.centroid_colors) + [GREY_LIGHT] * k)[:k]
+        if len(self.label_dirs) == k:
+            self.dirs = list(self.label_dirs)
+        else:
+            # Label each centroid on the side facing away from the origin
+            self.dirs = [np.append(c, 0) for c in normalize(self.centroids)]
+
+        self.winner, self.bar_heights = demo_assignment(self.centroids, self.query)
+        self.winner_small, _ = demo_assignment(self.centroids, self.query_small)
+
+        # Sparse top-1 code for the equivalence plot (k real latents + 2 "..." slots)
+        self.top1_activations = np.zeros(k + 2)
+        self.top1_activations[self.winner_small] = 0.85
+        self.neuron_colors = [
+            col if i == self.winner_small else TEXT_SECONDARY
+            for i, col in enumerate(self.colors + [TEXT_SECONDARY] * 2)
+        ]
 
-BLUE = "#165A95"
-ORANGE = "#ea580c"
-GREY_DARK = "#404040"
-GREY_MID = "#808080"
-GREY_LIGHT = "#b3b3b3"
+    def highlight_winner(self, dist_lines):
+        return [
+            line.animate.set_stroke(opacity=1, width=3) if i == self.winner
+            else line.animate.set_stroke(opacity=0.15)
+            for i, line in enumerate(dist_lines)
+        ]
 
-# Centroid colors (blue primary, grey for others)
-C1_COLOR = BLUE
-C2_COLOR = GREY_MID
-C3_COLOR = GREY_LIGHT
 
-# Point color (orange accent)
-POINT_COLOR = ORANGE
+def configure(scene_cls, name, **data):
+    """Scene class rendering scene_cls with other demo data, e.g.
 
+    Hexagon = configure(KMeansScene, "Hexagon", centroids=normalize(...))
+    """
+    return type(name, (scene_cls,), data)
 
-class SAEKMeansEquivalence(Scene):
-    def construct(self):
-        self.camera.background_color = BACKGROUND
 
-        self.intro()
-        self.kmeans_scene()
-        self.sae_scene()
-        self.equivalence_scene()
-        self.math_scene()
-        self.outro()
+class SAEKMeansEquivalence(DemoScene):
+    def construct(self):
+        for section in (self.intro, self.kmeans_scene, self.sae_scene,
+                        self.equivalence_scene, self.math_scene, self.outro):
+            with self.section(section.__name__):
+                section()
 
     def intro(self):
         """Title and hook"""
@@ -67,60 +173,17 @@ class SAEKMeansEquivalence(Scene):
         label.to_edge(UP, buff=0.5)
         self.play(FadeIn(label, shift=DOWN * 0.2), run_time=0.6)
 
-        # Create axes (subtle, not prominent)
-        axes = Axes(
-            x_range=[-2.5, 2.5, 1],
-            y_range=[-2.5, 2.5, 1],
-            x_length=5,
-            y_length=5,
-            tips=False,
-            axis_config={
-                "stroke_color": TEXT_SECONDARY,
-                "stroke_opacity": 0.3,
-                "stroke_width": 1,
-            }
-        )
-        axes.shift(LEFT * 2.5)
+        # Axes (subtle, not prominent) and unit circle (very subtle)
+        plot_axes = axes(KMEANS_AXES)
+        circle = unit_circle(KMEANS_AXES)
 
-        # Unit circle (very subtle)
-        circle = Circle(radius=axes.x_length / 5, color=TEXT_SECONDARY, stroke_opacity=0.2)
-        circle.move_to(axes.c2p(0, 0))
+        self.play(Create(plot_axes, run_time=0.8), Create(circle, run_time=0.8))
 
-        self.play(Create(axes, run_time=0.8), Create(circle, run_time=0.8))
-
-        # Centroids (normalized, on unit circle)
-        centroid_positions = [
-            (1, 0),           # c1: right
-            (-0.5, 0.866),    # c2: upper left
-            (-0.5, -0.866),   # c3: lower left
-        ]
-        centroid_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-        centroid_label_dirs = [RIGHT, UL, DL]
-
-        centroids = VGroup()
-        centroid_labels = VGroup()
-
-        for i, (pos, col, ldir) in enumerate(zip(centroid_positions, centroid_colors, centroid_label_dirs)):
-            # Centroid dot with glow effect
-            glow = Dot(
-                axes.c2p(pos[0], pos[1]),
-                radius=0.18,
-                color=col,
-                fill_opacity=0.3
-            )
-            dot = Dot(
-                axes.c2p(pos[0], pos[1]),
-                radius=0.12,
-                color=col,
-                fill_opacity=1
-            )
-            centroid = VGroup(glow, dot)
-            centroids.add(centroid)
-
-            # Label
-            label_text = MathTex(f"c_{i+1}", font_size=24, color=col)
-            label_text.next_to(dot, ldir, buff=0.15)
-            centroid_labels.add(label_text)
+        # Centroids (normalized, on unit circle) with glow effect
+        centroids, centroid_labels = centroid_markers(
+            KMEANS_AXES, self.centroids, self.colors, self.dirs,
+            radius=0.12, font_size=24, label_buff=0.15, glow_radius=0.18
+        )
 
         self.play(
             *[GrowFromCenter(c, run_time=0.6) for c in centroids],
@@ -134,28 +197,15 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.5)
 
         # Query point x
-        x_pos = np.array([0.5, 0.4])
-        x_glow = Dot(axes.c2p(x_pos[0], x_pos[1]), radius=0.14, color=POINT_COLOR, fill_opacity=0.3)
-        x_dot = Dot(axes.c2p(x_pos[0], x_pos[1]), radius=0.09, color=POINT_COLOR)
-        x_point = VGroup(x_glow, x_dot)
-        x_label = MathTex("x", font_size=26, color=POINT_COLOR)
-        x_label.next_to(x_dot, UR, buff=0.1)
+        x_point, x_label = query_marker(
+            KMEANS_AXES, self.query, radius=0.09, font_size=26, label_buff=0.1, glow_radius=0.14
+        )
 
         self.play(GrowFromCenter(x_point), FadeIn(x_label, shift=UP * 0.1), run_time=0.6)
         self.wait(0.5)
 
         # Draw distance lines
-        dist_lines = VGroup()
-        for i, (pos, col) in enumerate(zip(centroid_positions, centroid_colors)):
-            line = DashedLine(
-                axes.c2p(x_pos[0], x_pos[1]),
-                axes.c2p(pos[0], pos[1]),
-                color=col,
-                stroke_opacity=0.5,
-                stroke_width=2,
-                dash_length=0.08
-            )
-            dist_lines.add(line)
+        dist_lines = distance_lines(KMEANS_AXES, self.query, self.centroids, self.colors)
 
         self.play(
             *[Create(line) for line in dist_lines],
@@ -165,25 +215,16 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.3)
 
         # Formula on the right
-        formula = MathTex(
-            r"\text{cluster}(x) = \arg\min_i \|x - c_i\|^2",
-            font_size=26,
-            color=TEXT_PRIMARY
-        )
+        formula = math_tex(r"\text{cluster}(x) = \arg\min_i \|x - c_i\|^2", 26)
         formula.to_edge(RIGHT, buff=0.8).shift(UP * 1.5)
 
         self.play(Write(formula), run_time=1)
         self.wait(0.5)
 
-        # Highlight the closest (c1)
-        self.play(
-            dist_lines[0].animate.set_stroke(opacity=1, width=3),
-            dist_lines[1].animate.set_stroke(opacity=0.15),
-            dist_lines[2].animate.set_stroke(opacity=0.15),
-            run_time=0.6
-        )
+        # Highlight the closest
+        self.play(*self.highlight_winner(dist_lines), run_time=0.6)
 
-        result = MathTex(r"= c_1", font_size=26, color=C1_COLOR)
+        result = math_tex(f"= c_{{{self.winner + 1}}}", 26, self.colors[self.winner])
         result.next_to(formula, DOWN, aligned_edge=LEFT, buff=0.3)
 
         self.play(Write(result), run_time=0.5)
@@ -191,7 +232,7 @@ class SAEKMeansEquivalence(Scene):
 
         # Store for later
         self.kmeans_group = VGroup(
-            axes, circle, centroids, centroid_labels,
+            plot_axes, circle, centroids, centroid_labels,
             x_point, x_label, dist_lines, formula, result, label
         )
 
@@ -206,72 +247,21 @@ class SAEKMeansEquivalence(Scene):
         label.to_edge(UP, buff=0.5)
         self.play(FadeIn(label, shift=DOWN * 0.2), run_time=0.6)
 
-        # Input vector x
-        x_box = Rectangle(
-            width=0.6, height=1.8,
-            color=POINT_COLOR,
-            fill_opacity=0.15,
-            stroke_width=2
-        )
-        x_box.shift(LEFT * 4.5)
-        x_label = MathTex("x", font_size=28, color=POINT_COLOR)
-        x_label.next_to(x_box, DOWN, buff=0.2)
+        # Input vector x -> weight matrix W -> ReLU
+        (x_box, x_label, arrow1, w_box, w_label, arrow2,
+         relu_box, relu_label) = encoder_pipeline(-4.5, -1.5, 1)
 
         self.play(
             Create(x_box),
             FadeIn(x_label, shift=UP * 0.1),
             run_time=0.6
         )
-
-        # Weight matrix W
-        w_box = Rectangle(
-            width=1.8, height=1.8,
-            color=TEXT_PRIMARY,
-            fill_opacity=0.1,
-            stroke_width=2,
-            stroke_opacity=0.8
-        )
-        w_box.shift(LEFT * 1.5)
-        w_label = MathTex("W", font_size=28, color=TEXT_PRIMARY)
-        w_label.move_to(w_box)
-
-        # Arrow from x to W
-        arrow1 = Arrow(
-            x_box.get_right(),
-            w_box.get_left(),
-            buff=0.15,
-            color=TEXT_SECONDARY,
-            stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
-
         self.play(
             GrowArrow(arrow1),
             Create(w_box),
             FadeIn(w_label),
             run_time=0.7
         )
-
-        # ReLU box
-        relu_box = Rectangle(
-            width=1.2, height=1.2,
-            color=ORANGE,
-            fill_opacity=0.15,
-            stroke_width=2
-        )
-        relu_box.shift(RIGHT * 1)
-        relu_label = Text("ReLU", font_size=20, color=ORANGE)
-        relu_label.move_to(relu_box)
-
-        arrow2 = Arrow(
-            w_box.get_right(),
-            relu_box.get_left(),
-            buff=0.15,
-            color=TEXT_SECONDARY,
-            stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
-
         self.play(
             GrowArrow(arrow2),
             Create(relu_box),
@@ -279,33 +269,17 @@ class SAEKMeansEquivalence(Scene):
             run_time=0.7
         )
 
-        # Output activations z (as bars)
-        z_group = VGroup()
-        bar_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-        bar_heights = [0.9, 0.3, 0.15]  # c1 is highest
-
-        for i, (col, h) in enumerate(zip(bar_colors, bar_heights)):
-            bar = Rectangle(
-                width=0.35,
-                height=h * 1.5,
-                color=col,
-                fill_opacity=0.7,
-                stroke_width=1
-            )
-            bar.move_to(RIGHT * 3.5 + UP * (h * 0.75 - 0.5) + RIGHT * (i - 1) * 0.5)
-            z_group.add(bar)
+        # Output activations z = ReLU(Wx) (as bars), centered on x = 3.5
+        z_group = activation_bars(
+            self.bar_heights, self.colors,
+            first_center=3.5 - (len(self.centroids) - 1) * 0.25,
+            bottom=-0.5, width=0.35, spacing=0.5
+        )
 
-        z_label = MathTex("z", font_size=28, color=TEXT_PRIMARY)
+        z_label = math_tex("z", 28)
         z_label.next_to(z_group, DOWN, buff=0.3)
 
-        arrow3 = Arrow(
-            relu_box.get_right(),
-            z_group.get_left(),
-            buff=0.15,
-            color=TEXT_SECONDARY,
-            stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
+        arrow3 = pipeline_arrow(relu_box.get_right(), z_group.get_left())
 
         self.play(GrowArrow(arrow3), run_time=0.5)
         self.play(
@@ -317,35 +291,27 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.5)
 
         # Formula
-        formula = MathTex(
-            r"z = \text{ReLU}(Wx)",
-            font_size=26,
-            color=TEXT_PRIMARY
-        )
+        formula = math_tex(r"z = \text{ReLU}(Wx)", 26)
         formula.to_edge(DOWN, buff=1.2)
 
         self.play(Write(formula), run_time=0.8)
         self.wait(0.3)
 
         # Top-1 selection
-        top1_formula = MathTex(
-            r"\text{top}_1(x) = \arg\max_i \, z_i",
-            font_size=26,
-            color=TEXT_PRIMARY
-        )
+        top1_formula = math_tex(r"\text{top}_1(x) = \arg\max_i \, z_i", 26)
         top1_formula.next_to(formula, DOWN, buff=0.3)
 
         self.play(Write(top1_formula), run_time=0.8)
 
         # Highlight the tallest bar
         highlight_box = SurroundingRectangle(
-            z_group[0],
+            z_group[self.winner],
             color=POINT_COLOR,
             buff=0.08,
             stroke_width=2
         )
 
-        result = MathTex(r"= z_1", font_size=26, color=C1_COLOR)
+        result = math_tex(f"= z_{{{self.winner + 1}}}", 26, self.colors[self.winner])
         result.next_to(top1_formula, RIGHT, buff=0.3)
 
         self.play(Create(highlight_box), Write(result), run_time=0.6)
@@ -372,50 +338,21 @@ class SAEKMeansEquivalence(Scene):
         kmeans_title = Text("k-means", font_size=22, color=BLUE)
         kmeans_title.shift(LEFT * 3.5 + UP * 2)
 
-        # Small coordinate system with centroids
-        km_axes = Axes(
-            x_range=[-1.5, 1.5, 1],
-            y_range=[-1.5, 1.5, 1],
-            x_length=2.5,
-            y_length=2.5,
-            tips=False,
-            axis_config={
-                "stroke_color": TEXT_SECONDARY,
-                "stroke_opacity": 0.2,
-                "stroke_width": 1,
-            }
+        # Small coordinate system with centroids and the query point
+        km_axes = axes(EQUIV_AXES)
+        km_centroids, km_labels = centroid_markers(
+            EQUIV_AXES, self.centroids, self.colors, self.dirs,
+            radius=0.08, font_size=18, label_buff=0.08
+        )
+        km_x, km_x_label = query_marker(
+            EQUIV_AXES, self.query_small, radius=0.06, font_size=18, label_buff=0.05
         )
-        km_axes.shift(LEFT * 3.5 + DOWN * 0.3)
 
-        # Centroids (2D positions for axes)
-        centroid_positions_2d = [
-            (1, 0),
-            (-0.5, 0.866),
-            (-0.5, -0.866),
-        ]
-        centroid_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-
-        km_centroids = VGroup()
-        km_labels = VGroup()
-        label_dirs = [RIGHT, UL, DL]  # directions for labels
-        for i, (pos, col, ldir) in enumerate(zip(centroid_positions_2d, centroid_colors, label_dirs)):
-            dot = Dot(km_axes.c2p(pos[0], pos[1]), radius=0.08, color=col)
-            km_centroids.add(dot)
-            lbl = MathTex(f"c_{i+1}", font_size=18, color=col)
-            lbl.next_to(dot, ldir, buff=0.08)
-            km_labels.add(lbl)
-
-        # Query point
-        x_pos = (0.4, 0.3)
-        km_x = Dot(km_axes.c2p(x_pos[0], x_pos[1]), radius=0.06, color=POINT_COLOR)
-        km_x_label = MathTex("x", font_size=18, color=POINT_COLOR)
-        km_x_label.next_to(km_x, UR, buff=0.05)
-
-        # Distance line to nearest (c1)
+        # Distance line to nearest centroid
         km_dist_line = Line(
-            km_axes.c2p(x_pos[0], x_pos[1]),
-            km_axes.c2p(centroid_positions_2d[0][0], centroid_positions_2d[0][1]),
-            color=C1_COLOR,
+            km_x.get_center(),
+            km_centroids[self.winner_small].get_center(),
+            color=self.colors[self.winner_small],
             stroke_width=2
         )
 
@@ -441,49 +378,25 @@ class SAEKMeansEquivalence(Scene):
         sae_title.shift(RIGHT * 3.5 + UP * 2)
 
         # Sparse activation vector (vertical bars)
-        # Most are zero (gray), one is active (colored)
-        sae_bars = VGroup()
-        bar_x_start = RIGHT * 2.2
-        bar_width = 0.25
-        bar_spacing = 0.35
-
-        # Values: mostly 0, neuron 1 active
-        activations = [0.85, 0.0, 0.0, 0.0, 0.0]  # first neuron active
-        neuron_colors = [C1_COLOR, TEXT_SECONDARY, TEXT_SECONDARY, TEXT_SECONDARY, TEXT_SECONDARY]
-
-        for i, (val, col) in enumerate(zip(activations, neuron_colors)):
-            if val > 0:
-                bar = Rectangle(
-                    width=bar_width,
-                    height=val * 1.5,
-                    color=col,
-                    fill_opacity=0.8,
-                    stroke_width=1
-                )
-            else:
-                # Empty/zero bar
-                bar = Rectangle(
-                    width=bar_width,
-                    height=0.08,
-                    color=TEXT_SECONDARY,
-                    fill_opacity=0.3,
-                    stroke_width=1
-                )
-            bar.move_to(bar_x_start + RIGHT * i * bar_spacing + DOWN * 0.3)
-            bar.align_to(bar_x_start + DOWN * 1, DOWN)
-            sae_bars.add(bar)
+        # Most are zero (gray), only the top-1 neuron is active (colored)
+        sae_bars = activation_bars(
+            self.top1_activations, self.neuron_colors,
+            first_center=2.2, bottom=-1, width=0.25, spacing=0.35,
+            fill_opacity=0.8, zero_height=0.08
+        )
 
         # Label for z
-        z_label = MathTex("z", font_size=22, color=TEXT_PRIMARY)
+        z_label = math_tex("z", 22)
         z_label.next_to(sae_bars, DOWN, buff=0.25)
 
         # Neuron labels
+        k = len(self.centroids)
         neuron_labels = VGroup()
-        for i in range(5):
-            if i < 3:
-                nl = MathTex(f"z_{i+1}", font_size=14, color=neuron_colors[i])
+        for i in range(k + 2):
+            if i < k:
+                nl = math_tex(f"z_{{{i + 1}}}", 14, self.neuron_colors[i])
             else:
-                nl = MathTex(r"\cdots", font_size=14, color=TEXT_SECONDARY)
+                nl = math_tex(r"\cdots", 14, TEXT_SECONDARY)
             nl.next_to(sae_bars[i], UP, buff=0.1)
             neuron_labels.add(nl)
 
@@ -498,16 +411,16 @@ class SAEKMeansEquivalence(Scene):
         )
         self.play(
             FadeIn(z_label),
-            *[FadeIn(nl) for nl in neuron_labels[:3]],
+            *[FadeIn(nl) for nl in neuron_labels[:k]],
             run_time=0.4
         )
 
         # === CONNECTING ARROW: active neuron → centroid ===
-        # Show that z_1 (active neuron) corresponds to c_1 (nearest centroid)
+        # Show that the active neuron corresponds to the nearest centroid
 
         # Highlight the active neuron
         active_highlight = SurroundingRectangle(
-            sae_bars[0],
+            sae_bars[self.winner_small],
             color=POINT_COLOR,
             buff=0.05,
             stroke_width=2
@@ -519,7 +432,7 @@ class SAEKMeansEquivalence(Scene):
             color=POINT_COLOR,
             stroke_width=2
         )
-        centroid_highlight.move_to(km_centroids[0])
+        centroid_highlight.move_to(km_centroids[self.winner_small])
 
         self.play(
             Create(active_highlight),
@@ -529,8 +442,8 @@ class SAEKMeansEquivalence(Scene):
 
         # Curved arrow connecting them
         connect_arrow = CurvedArrow(
-            sae_bars[0].get_left() + LEFT * 0.1,
-            km_centroids[0].get_right() + RIGHT * 0.2,
+            sae_bars[self.winner_small].get_left() + LEFT * 0.1,
+            km_centroids[self.winner_small].get_right() + RIGHT * 0.2,
             color=POINT_COLOR,
             stroke_width=2,
             angle=-TAU/4,
@@ -547,21 +460,13 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.5)
 
         # === EQUATIONS AT BOTTOM ===
-        km_eq = MathTex(
-            r"\arg\min_i \|x - c_i\|^2",
-            font_size=22,
-            color=BLUE
-        )
+        km_eq = math_tex(r"\arg\min_i \|x - c_i\|^2", 22, BLUE)
         km_eq.shift(LEFT * 3.5 + DOWN * 2.3)
 
-        sae_eq = MathTex(
-            r"\arg\max_i \, z_i",
-            font_size=22,
-            color=BLUE
-        )
+        sae_eq = math_tex(r"\arg\max_i \, z_i", 22, BLUE)
         sae_eq.shift(RIGHT * 3.5 + DOWN * 2.3)
 
-        equals = MathTex(r"=", font_size=32, color=POINT_COLOR)
+        equals = math_tex(r"=", 32, POINT_COLOR)
         equals.move_to(DOWN * 2.3)
 
         self.play(
@@ -616,17 +521,11 @@ class SAEKMeansEquivalence(Scene):
         step2_label = Text("2. if centroids are normalized", font_size=20, color=TEXT_SECONDARY)
         step2_label.shift(UP * 0.3 + LEFT * 3)
 
-        step2a = MathTex(
-            r"\|c_i\| = 1",
-            font_size=26,
-            color=BLUE
-        )
+        step2a = math_tex(r"\|c_i\| = 1", 26, BLUE)
         step2a.next_to(step2_label, DOWN, buff=0.3, aligned_edge=LEFT)
 
-        step2b = MathTex(
-            r"\Rightarrow \arg\min_i \|x - c_i\|^2 = \arg\max_i \langle x, c_i \rangle",
-            font_size=24,
-            color=TEXT_PRIMARY
+        step2b = math_tex(
+            r"\Rightarrow \arg\min_i \|x - c_i\|^2 = \arg\max_i \langle x, c_i \rangle", 24
         )
         step2b.next_to(step2a, DOWN, buff=0.25, aligned_edge=LEFT)
 
@@ -640,11 +539,7 @@ class SAEKMeansEquivalence(Scene):
         step3_label = Text("3. ReLU preserves ordering", font_size=20, color=TEXT_SECONDARY)
         step3_label.shift(DOWN * 1.5 + LEFT * 3)
 
-        step3 = MathTex(
-            r"a > b, \, a > 0 \;\Rightarrow\; \text{ReLU}(a) > \text{ReLU}(b)",
-            font_size=24,
-            color=TEXT_PRIMARY
-        )
+        step3 = math_tex(r"a > b, \, a > 0 \;\Rightarrow\; \text{ReLU}(a) > \text{ReLU}(b)", 24)
         step3.next_to(step3_label, DOWN, buff=0.3, aligned_edge=LEFT)
 
         # ReLU image on the right
@@ -657,11 +552,7 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.8)
 
         # QED
-        qed = MathTex(
-            r"\therefore \quad \text{SAE top-1} = \text{k-means}",
-            font_size=28,
-            color=BLUE
-        )
+        qed = math_tex(r"\therefore \quad \text{SAE top-1} = \text{k-means}", 28, BLUE)
         qed.shift(DOWN * 2.8)
 
         qed_box = SurroundingRectangle(qed, color=BLUE, buff=0.2, stroke_width=2)
@@ -689,197 +580,237 @@ class SAEKMeansEquivalence(Scene):
         self.wait(0.5)
 
 
-# === INDIVIDUAL SCENES FOR GIF EXPORT ===
+# === LARGE DATASETS ===
+
+class PointCloudScene(DemoScene):
+    """Tens of thousands of points colored by their SAE top-1 latent
+
+    The whole dataset is one PMobject: assignment is one batched call into
+    the engine and coloring is a palette lookup on the index array.
+    """
+    centroids = ring_centroids(8)
+    n_points = 20000
+    cloud_seed = 0
 
-class KMeansScene(Scene):
-    """K-means clustering visualization - for README section"""
     def construct(self):
-        self.camera.background_color = BACKGROUND
+        points = sample_cloud(self.centroids, self.n_points, seed=self.cloud_seed)
+        kmeans_idx, sae_idx, values = assign(points, self.centroids)
+        # Rows with every activation <= 0 violate h_pos; they stay grey
+        active = values > 0
+        assert np.array_equal(kmeans_idx[active], sae_idx[active]), \
+            "point cloud violates the proven equivalence"
+        labels = np.where(active, sae_idx, -1)
+        palette = color_gradient([BLUE, GREY_MID, ORANGE], len(self.centroids))
+
+        plot_axes = axes(CLOUD_AXES)
+        circle = unit_circle(CLOUD_AXES)
+        self.play(Create(plot_axes, run_time=0.6), Create(circle, run_time=0.6))
 
-        # Create axes
-        axes = Axes(
-            x_range=[-2.5, 2.5, 1],
-            y_range=[-2.5, 2.5, 1],
-            x_length=5,
-            y_length=5,
-            tips=False,
-            axis_config={
-                "stroke_color": TEXT_SECONDARY,
-                "stroke_opacity": 0.3,
-                "stroke_width": 1,
-            }
+        # Unassigned cloud first, then every point takes its latent's color
+        cloud = point_cloud(CLOUD_AXES, points, np.full(len(points), -1), palette)
+        assigned = point_cloud(CLOUD_AXES, points, labels, palette)
+
+        caption = Text(f"{len(points):,} points, k = {len(self.centroids)}",
+                       font_size=20, color=TEXT_SECONDARY)
+        caption.to_edge(UP, buff=0.3)
+
+        self.play(FadeIn(cloud), FadeIn(caption), run_time=0.8)
+
+        centroids, centroid_labels = centroid_markers(
+            CLOUD_AXES, self.centroids, palette, self.dirs,
+            radius=0.08, font_size=18, label_buff=0.08, glow_radius=0.14
         )
+        self.play(*[GrowFromCenter(c) for c in centroids], *[FadeIn(l) for l in centroid_labels],
+                  run_time=0.6)
 
-        # Unit circle
-        circle = Circle(radius=axes.x_length / 5, color=TEXT_SECONDARY, stroke_opacity=0.2)
-        circle.move_to(axes.c2p(0, 0))
+        formula = math_tex(r"\text{top}_1(x) = \arg\max_i \, \text{ReLU}(\langle c_i, x \rangle)", 22)
+        formula.to_edge(DOWN, buff=0.3)
 
-        self.play(Create(axes, run_time=0.6), Create(circle, run_time=0.6))
+        self.play(Transform(cloud, assigned), Write(formula), run_time=1.5)
+        self.wait(1.5)
 
-        # Centroids
-        centroid_positions = [
-            (1, 0),
-            (-0.5, 0.866),
-            (-0.5, -0.866),
-        ]
-        centroid_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-        centroid_label_dirs = [RIGHT, UL, DL]
 
-        centroids = VGroup()
-        centroid_labels = VGroup()
+class VoronoiScene(DemoScene):
+    """Assignment regions for the demo centroids, then for many centroids
+
+    Every pixel of the plot is assigned by one batched GEMM + argmax in the
+    engine and drawn as a single image, so k = 128 costs the same number of
+    mobjects as k = 3.
+    """
+    many_k = 128
+    many_seed = 0
 
-        for i, (pos, col, ldir) in enumerate(zip(centroid_positions, centroid_colors, centroid_label_dirs)):
-            glow = Dot(axes.c2p(pos[0], pos[1]), radius=0.18, color=col, fill_opacity=0.3)
-            dot = Dot(axes.c2p(pos[0], pos[1]), radius=0.12, color=col, fill_opacity=1)
-            centroid = VGroup(glow, dot)
-            centroids.add(centroid)
+    def assignment_map(self, centroids, resolution):
+        labels = kmeans_assign(pixel_grid(VORONOI_AXES, resolution), centroids)
+        return labels.reshape(resolution, resolution)
+
+    def construct(self):
+        # One image pixel per output pixel
+        resolution = int(np.ceil(VORONOI_AXES.length * config.pixel_height / config.frame_height))
+        rng = np.random.default_rng(self.many_seed)
+        many = rng.uniform(-VORONOI_AXES.extent, VORONOI_AXES.extent, size=(self.many_k, 2))
+        # Shuffled gradient so neighbouring regions get distinct shades
+        gradient = color_gradient([BLUE, GREY_LIGHT, ORANGE], self.many_k)
+        many_palette = [gradient[i] for i in rng.permutation(self.many_k)]
+
+        plot_axes = axes(VORONOI_AXES)
+        regions = region_image(VORONOI_AXES, self.assignment_map(self.centroids, resolution),
+                               self.colors)
+        centroids, centroid_labels = centroid_markers(
+            VORONOI_AXES, self.centroids, self.colors, self.dirs,
+            radius=0.08, font_size=18, label_buff=0.08
+        )
+        caption = Text(f"k = {len(self.centroids)}", font_size=20, color=TEXT_SECONDARY)
+        caption.to_edge(UP, buff=0.3)
+
+        self.play(Create(plot_axes), FadeIn(caption), run_time=0.6)
+        self.play(*[GrowFromCenter(c) for c in centroids], *[FadeIn(l) for l in centroid_labels],
+                  run_time=0.5)
+        # Regions sit under the axes and centroid markers
+        self.bring_to_back(regions)
+        self.play(FadeIn(regions), run_time=0.8)
+        self.wait(1)
 
-            label_text = MathTex(f"c_{i+1}", font_size=24, color=col)
-            label_text.next_to(dot, ldir, buff=0.15)
-            centroid_labels.add(label_text)
+        many_regions = region_image(VORONOI_AXES, self.assignment_map(many, resolution),
+                                    many_palette)
+        many_dots = point_cloud(VORONOI_AXES, many, np.zeros(len(many), dtype=np.int64),
+                                [TEXT_PRIMARY], stroke_width=4, opacity=1)
+        many_caption = Text(f"k = {self.many_k}, {resolution ** 2:,} pixels assigned by GEMM",
+                            font_size=20, color=TEXT_SECONDARY)
+        many_caption.to_edge(UP, buff=0.3)
 
+        self.bring_to_back(many_regions)
         self.play(
-            *[GrowFromCenter(c, run_time=0.5) for c in centroids],
-            lag_ratio=0.1
+            FadeOut(centroids), FadeOut(centroid_labels),
+            FadeOut(regions), FadeIn(many_regions), FadeIn(many_dots),
+            Transform(caption, many_caption),
+            run_time=1.2
         )
-        self.play(
-            *[FadeIn(l, shift=UP * 0.1) for l in centroid_labels],
-            lag_ratio=0.1,
-            run_time=0.4
+        self.wait(1.5)
+
+
+class LloydScene(DemoScene):
+    """Lloyd's algorithm on a generated dataset, one assignment + update per step
+
+    All iterations are computed up front by `lloyd_history`; the animation
+    only replays recolorings of one point cloud and k centroid moves.
+    """
+    blob_centers = [(-1.2, 0.9), (1.1, 1.0), (0.9, -1.0), (-0.9, -1.1)]
+    lloyd_k = 4
+    lloyd_points = 600
+    lloyd_iters = 30
+    lloyd_seed = 1
+
+    def construct(self):
+        rng = np.random.default_rng(self.lloyd_seed)
+        x = sample_blobs(self.blob_centers, self.lloyd_points, seed=self.lloyd_seed)
+        init = x[rng.choice(len(x), self.lloyd_k, replace=False)]
+        history, labels, inertia = lloyd_history(x, init, iters=self.lloyd_iters)
+        palette = color_gradient([BLUE, GREY_MID, ORANGE], self.lloyd_k)
+
+        plot_axes = axes(LLOYD_AXES)
+        cloud = point_cloud(LLOYD_AXES, x, np.full(len(x), -1), palette, stroke_width=3, opacity=0.8)
+        dots = VGroup(*[
+            Dot(pos, radius=0.1, color=col).set_stroke(TEXT_PRIMARY, width=2)
+            for pos, col in zip(screen_points(LLOYD_AXES, history[0]), palette)
+        ])
+
+        def status(step):
+            text = f"iteration {step}" if step == 0 else f"iteration {step}   inertia {inertia[step - 1]:.1f}"
+            return Text(text, font_size=20, color=TEXT_SECONDARY).to_edge(UP, buff=0.3)
+
+        counter = status(0)
+        self.play(Create(plot_axes), FadeIn(cloud), FadeIn(counter), run_time=0.8)
+        self.play(*[GrowFromCenter(d) for d in dots], run_time=0.5)
+
+        for step in range(len(labels)):
+            # Early steps are shown slowly, later (small) ones quickly
+            run_time = max(0.15, 0.8 * 0.8 ** step)
+            # Assignment: every point takes its nearest centroid's color
+            self.play(
+                Transform(cloud, point_cloud(LLOYD_AXES, x, labels[step], palette,
+                                             stroke_width=3, opacity=0.8)),
+                Transform(counter, status(step + 1)),
+                run_time=run_time
+            )
+            # Update: centroids move to the mean of their points
+            targets = screen_points(LLOYD_AXES, history[step + 1])
+            self.play(*[d.animate.move_to(p) for d, p in zip(dots, targets)], run_time=run_time)
+
+        self.wait(1.5)
+
+
+# === INDIVIDUAL SCENES FOR GIF EXPORT ===
+
+class KMeansScene(DemoScene):
+    """K-means clustering visualization - for README section"""
+    def construct(self):
+        # Axes and unit circle
+        plot_axes = axes(KMEANS_AXES_README)
+        circle = unit_circle(KMEANS_AXES_README)
+
+        self.play(Create(plot_axes, run_time=0.6), Create(circle, run_time=0.6))
+
+        # Centroids
+        centroids, centroid_labels = centroid_markers(
+            KMEANS_AXES_README, self.centroids, self.colors, self.dirs,
+            radius=0.12, font_size=24, label_buff=0.15, glow_radius=0.18
         )
 
+        self.play(*[GrowFromCenter(c, run_time=0.5) for c in centroids], lag_ratio=0.1)
+        self.play(*[FadeIn(l, shift=UP * 0.1) for l in centroid_labels], lag_ratio=0.1, run_time=0.4)
+
         # Query point x
-        x_pos = np.array([0.5, 0.4])
-        x_glow = Dot(axes.c2p(x_pos[0], x_pos[1]), radius=0.14, color=POINT_COLOR, fill_opacity=0.3)
-        x_dot = Dot(axes.c2p(x_pos[0], x_pos[1]), radius=0.09, color=POINT_COLOR)
-        x_point = VGroup(x_glow, x_dot)
-        x_label = MathTex("x", font_size=26, color=POINT_COLOR)
-        x_label.next_to(x_dot, UR, buff=0.1)
+        x_point, x_label = query_marker(
+            KMEANS_AXES_README, self.query, radius=0.09, font_size=26, label_buff=0.1,
+            glow_radius=0.14
+        )
 
         self.play(GrowFromCenter(x_point), FadeIn(x_label, shift=UP * 0.1), run_time=0.5)
 
         # Distance lines
-        dist_lines = VGroup()
-        for i, (pos, col) in enumerate(zip(centroid_positions, centroid_colors)):
-            line = DashedLine(
-                axes.c2p(x_pos[0], x_pos[1]),
-                axes.c2p(pos[0], pos[1]),
-                color=col,
-                stroke_opacity=0.5,
-                stroke_width=2,
-                dash_length=0.08
-            )
-            dist_lines.add(line)
+        dist_lines = distance_lines(KMEANS_AXES_README, self.query, self.centroids, self.colors)
 
-        self.play(
-            *[Create(line) for line in dist_lines],
-            lag_ratio=0.1,
-            run_time=0.6
-        )
+        self.play(*[Create(line) for line in dist_lines], lag_ratio=0.1, run_time=0.6)
 
         # Formula
-        formula = MathTex(
-            r"\text{cluster}(x) = \arg\min_i \|x - c_i\|^2",
-            font_size=24,
-            color=TEXT_PRIMARY
-        )
+        formula = math_tex(r"\text{cluster}(x) = \arg\min_i \|x - c_i\|^2", 24)
         formula.to_edge(DOWN, buff=0.8)
 
         self.play(Write(formula), run_time=0.8)
 
         # Highlight closest
-        self.play(
-            dist_lines[0].animate.set_stroke(opacity=1, width=3),
-            dist_lines[1].animate.set_stroke(opacity=0.15),
-            dist_lines[2].animate.set_stroke(opacity=0.15),
-            run_time=0.5
-        )
+        self.play(*self.highlight_winner(dist_lines), run_time=0.5)
 
-        result = MathTex(r"= c_1", font_size=24, color=C1_COLOR)
+        result = math_tex(f"= c_{{{self.winner + 1}}}", 24, self.colors[self.winner])
         result.next_to(formula, RIGHT, buff=0.2)
 
         self.play(Write(result), run_time=0.4)
         self.wait(1)
 
 
-class SAEScene(Scene):
+class SAEScene(DemoScene):
     """SAE encoding visualization - for README section"""
     def construct(self):
-        self.camera.background_color = BACKGROUND
-
-        # Input vector x
-        x_box = Rectangle(
-            width=0.6, height=1.8,
-            color=POINT_COLOR,
-            fill_opacity=0.15,
-            stroke_width=2
-        )
-        x_box.shift(LEFT * 4)
-        x_label = MathTex("x", font_size=28, color=POINT_COLOR)
-        x_label.next_to(x_box, DOWN, buff=0.2)
+        # Input vector x -> weight matrix W -> ReLU
+        (x_box, x_label, arrow1, w_box, w_label, arrow2,
+         relu_box, relu_label) = encoder_pipeline(-4, -1, 1.5)
 
         self.play(Create(x_box), FadeIn(x_label, shift=UP * 0.1), run_time=0.5)
-
-        # Weight matrix W
-        w_box = Rectangle(
-            width=1.8, height=1.8,
-            color=TEXT_PRIMARY,
-            fill_opacity=0.1,
-            stroke_width=2,
-            stroke_opacity=0.8
-        )
-        w_box.shift(LEFT * 1)
-        w_label = MathTex("W", font_size=28, color=TEXT_PRIMARY)
-        w_label.move_to(w_box)
-
-        arrow1 = Arrow(
-            x_box.get_right(), w_box.get_left(),
-            buff=0.15, color=TEXT_SECONDARY, stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
-
         self.play(GrowArrow(arrow1), Create(w_box), FadeIn(w_label), run_time=0.6)
-
-        # ReLU box
-        relu_box = Rectangle(
-            width=1.2, height=1.2,
-            color=ORANGE,
-            fill_opacity=0.15,
-            stroke_width=2
-        )
-        relu_box.shift(RIGHT * 1.5)
-        relu_label = Text("ReLU", font_size=20, color=ORANGE)
-        relu_label.move_to(relu_box)
-
-        arrow2 = Arrow(
-            w_box.get_right(), relu_box.get_left(),
-            buff=0.15, color=TEXT_SECONDARY, stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
-
         self.play(GrowArrow(arrow2), Create(relu_box), FadeIn(relu_label), run_time=0.6)
 
-        # Output activations z (as bars)
-        z_group = VGroup()
-        bar_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-        bar_heights = [0.9, 0.3, 0.15]
-
-        for i, (col, h) in enumerate(zip(bar_colors, bar_heights)):
-            bar = Rectangle(
-                width=0.35, height=h * 1.5,
-                color=col, fill_opacity=0.7, stroke_width=1
-            )
-            bar.move_to(RIGHT * 4 + UP * (h * 0.75 - 0.5) + RIGHT * (i - 1) * 0.5)
-            z_group.add(bar)
+        # Output activations z, centered on x = 4
+        z_group = activation_bars(
+            self.bar_heights, self.colors,
+            first_center=4 - (len(self.centroids) - 1) * 0.25,
+            bottom=-0.5, width=0.35, spacing=0.5
+        )
 
-        z_label = MathTex("z", font_size=28, color=TEXT_PRIMARY)
+        z_label = math_tex("z", 28)
         z_label.next_to(z_group, DOWN, buff=0.3)
 
-        arrow3 = Arrow(
-            relu_box.get_right(), z_group.get_left(),
-            buff=0.15, color=TEXT_SECONDARY, stroke_width=2,
-            max_tip_length_to_length_ratio=0.15
-        )
+        arrow3 = pipeline_arrow(relu_box.get_right(), z_group.get_left())
 
         self.play(GrowArrow(arrow3), run_time=0.4)
         self.play(
@@ -889,110 +820,66 @@ class SAEScene(Scene):
             run_time=0.6
         )
 
-        # Formula
-        formula = MathTex(r"z = \text{ReLU}(Wx)", font_size=24, color=TEXT_PRIMARY)
+        # Formulas
+        formula = math_tex(r"z = \text{ReLU}(Wx)", 24)
         formula.to_edge(DOWN, buff=1)
-
         self.play(Write(formula), run_time=0.6)
 
-        # Top-1 selection
-        top1_formula = MathTex(r"\text{top}_1(x) = \arg\max_i \, z_i", font_size=24, color=TEXT_PRIMARY)
+        top1_formula = math_tex(r"\text{top}_1(x) = \arg\max_i \, z_i", 24)
         top1_formula.next_to(formula, DOWN, buff=0.25)
-
         self.play(Write(top1_formula), run_time=0.6)
 
         # Highlight tallest bar
-        highlight_box = SurroundingRectangle(z_group[0], color=POINT_COLOR, buff=0.08, stroke_width=2)
-        result = MathTex(r"= z_1", font_size=24, color=C1_COLOR)
+        highlight_box = SurroundingRectangle(z_group[self.winner], color=POINT_COLOR, buff=0.08, stroke_width=2)
+        result = math_tex(f"= z_{{{self.winner + 1}}}", 24, self.colors[self.winner])
         result.next_to(top1_formula, RIGHT, buff=0.2)
 
         self.play(Create(highlight_box), Write(result), run_time=0.5)
         self.wait(1)
 
 
-class EquivalenceScene(Scene):
+class EquivalenceScene(DemoScene):
     """Side-by-side equivalence visualization - for README section"""
     def construct(self):
-        self.camera.background_color = BACKGROUND
-
-        # === LEFT SIDE: K-MEANS ===
+        # === LEFT: K-MEANS ===
         kmeans_title = Text("k-means", font_size=22, color=BLUE)
         kmeans_title.shift(LEFT * 3.5 + UP * 2.3)
 
-        km_axes = Axes(
-            x_range=[-1.5, 1.5, 1],
-            y_range=[-1.5, 1.5, 1],
-            x_length=2.5,
-            y_length=2.5,
-            tips=False,
-            axis_config={"stroke_color": TEXT_SECONDARY, "stroke_opacity": 0.2, "stroke_width": 1}
+        km_axes = axes(EQUIV_AXES_README)
+        km_centroids, km_labels = centroid_markers(
+            EQUIV_AXES_README, self.centroids, self.colors, self.dirs,
+            radius=0.08, font_size=18, label_buff=0.08
+        )
+        km_x, km_x_label = query_marker(
+            EQUIV_AXES_README, self.query_small, radius=0.06, font_size=18, label_buff=0.05
         )
-        km_axes.shift(LEFT * 3.5)
-
-        centroid_positions_2d = [(1, 0), (-0.5, 0.866), (-0.5, -0.866)]
-        centroid_colors = [C1_COLOR, C2_COLOR, C3_COLOR]
-        label_dirs = [RIGHT, UL, DL]
-
-        km_centroids = VGroup()
-        km_labels = VGroup()
-        for i, (pos, col, ldir) in enumerate(zip(centroid_positions_2d, centroid_colors, label_dirs)):
-            dot = Dot(km_axes.c2p(pos[0], pos[1]), radius=0.08, color=col)
-            km_centroids.add(dot)
-            lbl = MathTex(f"c_{i+1}", font_size=18, color=col)
-            lbl.next_to(dot, ldir, buff=0.08)
-            km_labels.add(lbl)
-
-        x_pos = (0.4, 0.3)
-        km_x = Dot(km_axes.c2p(x_pos[0], x_pos[1]), radius=0.06, color=POINT_COLOR)
-        km_x_label = MathTex("x", font_size=18, color=POINT_COLOR)
-        km_x_label.next_to(km_x, UR, buff=0.05)
 
         km_dist_line = Line(
-            km_axes.c2p(x_pos[0], x_pos[1]),
-            km_axes.c2p(centroid_positions_2d[0][0], centroid_positions_2d[0][1]),
-            color=C1_COLOR, stroke_width=2
+            km_x.get_center(), km_centroids[self.winner_small].get_center(),
+            color=self.colors[self.winner_small], stroke_width=2
         )
 
-        self.play(
-            FadeIn(kmeans_title, shift=DOWN * 0.1),
-            Create(km_axes),
-            run_time=0.5
-        )
-        self.play(
-            *[GrowFromCenter(c) for c in km_centroids],
-            *[FadeIn(l) for l in km_labels],
-            run_time=0.4
-        )
+        self.play(FadeIn(kmeans_title, shift=DOWN * 0.1), Create(km_axes), run_time=0.5)
+        self.play(*[GrowFromCenter(c) for c in km_centroids], *[FadeIn(l) for l in km_labels], run_time=0.4)
         self.play(GrowFromCenter(km_x), FadeIn(km_x_label), run_time=0.3)
         self.play(Create(km_dist_line), run_time=0.3)
 
-        # === RIGHT SIDE: SAE ===
+        # === RIGHT: SAE ===
         sae_title = Text("SAE", font_size=22, color=BLUE)
         sae_title.shift(RIGHT * 3.5 + UP * 2.3)
 
-        sae_bars = VGroup()
-        bar_x_start = RIGHT * 2.2
-        bar_width = 0.25
-        bar_spacing = 0.35
-
-        activations = [0.85, 0.0, 0.0, 0.0, 0.0]
-        neuron_colors = [C1_COLOR, TEXT_SECONDARY, TEXT_SECONDARY, TEXT_SECONDARY, TEXT_SECONDARY]
-
-        for i, (val, col) in enumerate(zip(activations, neuron_colors)):
-            if val > 0:
-                bar = Rectangle(width=bar_width, height=val * 1.5, color=col, fill_opacity=0.8, stroke_width=1)
-            else:
-                bar = Rectangle(width=bar_width, height=0.08, color=TEXT_SECONDARY, fill_opacity=0.3, stroke_width=1)
-            bar.move_to(bar_x_start + RIGHT * i * bar_spacing)
-            bar.align_to(bar_x_start + DOWN * 0.8, DOWN)
-            sae_bars.add(bar)
+        sae_bars = activation_bars(
+            self.top1_activations, self.neuron_colors,
+            first_center=2.2, bottom=-0.8, width=0.25, spacing=0.35,
+            fill_opacity=0.8, zero_height=0.08
+        )
 
-        z_label = MathTex("z", font_size=22, color=TEXT_PRIMARY)
+        z_label = math_tex("z", 22)
         z_label.next_to(sae_bars, DOWN, buff=0.25)
 
         neuron_labels = VGroup()
-        for i in range(3):
-            nl = MathTex(f"z_{i+1}", font_size=14, color=neuron_colors[i])
+        for i in range(len(self.centroids)):
+            nl = math_tex(f"z_{{{i + 1}}}", 14, self.neuron_colors[i])
             nl.next_to(sae_bars[i], UP, buff=0.1)
             neuron_labels.add(nl)
 
@@ -1000,16 +887,18 @@ class EquivalenceScene(Scene):
         self.play(*[GrowFromEdge(bar, DOWN) for bar in sae_bars], lag_ratio=0.05, run_time=0.5)
         self.play(FadeIn(z_label), *[FadeIn(nl) for nl in neuron_labels], run_time=0.3)
 
-        # === HIGHLIGHTS AND CONNECTION ===
-        active_highlight = SurroundingRectangle(sae_bars[0], color=POINT_COLOR, buff=0.05, stroke_width=2)
+        # === CONNECTION ===
+        active_highlight = SurroundingRectangle(
+            sae_bars[self.winner_small], color=POINT_COLOR, buff=0.05, stroke_width=2
+        )
         centroid_highlight = Circle(radius=0.15, color=POINT_COLOR, stroke_width=2)
-        centroid_highlight.move_to(km_centroids[0])
+        centroid_highlight.move_to(km_centroids[self.winner_small])
 
         self.play(Create(active_highlight), Create(centroid_highlight), run_time=0.4)
 
         connect_arrow = CurvedArrow(
-            sae_bars[0].get_left() + LEFT * 0.1,
-            km_centroids[0].get_right() + RIGHT * 0.2,
+            sae_bars[self.winner_small].get_left() + LEFT * 0.1,
+            km_centroids[self.winner_small].get_right() + RIGHT * 0.2,
             color=POINT_COLOR, stroke_width=2, angle=-TAU/4, tip_length=0.15
         )
         self.play(Create(connect_arrow), run_time=0.5)
@@ -1018,27 +907,24 @@ class EquivalenceScene(Scene):
         same_label.next_to(connect_arrow, UP, buff=0.15)
         self.play(FadeIn(same_label, shift=DOWN * 0.1), run_time=0.3)
 
-        # === EQUATIONS AT BOTTOM ===
-        km_eq = MathTex(r"\arg\min_i \|x - c_i\|^2", font_size=22, color=BLUE)
+        # === EQUATIONS ===
+        km_eq = math_tex(r"\arg\min_i \|x - c_i\|^2", 22, BLUE)
         km_eq.shift(LEFT * 3.5 + DOWN * 2.5)
 
-        sae_eq = MathTex(r"\arg\max_i \, z_i", font_size=22, color=BLUE)
+        sae_eq = math_tex(r"\arg\max_i \, z_i", 22, BLUE)
         sae_eq.shift(RIGHT * 3.5 + DOWN * 2.5)
 
-        equals = MathTex(r"=", font_size=32, color=POINT_COLOR)
+        equals = math_tex(r"=", 32, POINT_COLOR)
         equals.move_to(DOWN * 2.5)
 
         self.play(Write(km_eq), Write(sae_eq), run_time=0.5)
         self.play(Write(equals), run_time=0.3)
-
         self.wait(1.5)
 
 
-class MathScene(Scene):
+class MathScene(DemoScene):
     """Mathematical proof steps - for README section"""
     def construct(self):
-        self.camera.background_color = BACKGROUND
-
         # Step 1: Distance decomposition
         step1_label = Text("1. expand the distance", font_size=20, color=TEXT_SECONDARY)
         step1_label.shift(UP * 2.5 + LEFT * 3)
@@ -1059,12 +945,11 @@ class MathScene(Scene):
         step2_label = Text("2. if centroids are normalized", font_size=20, color=TEXT_SECONDARY)
         step2_label.shift(UP * 0.7 + LEFT * 3)
 
-        step2a = MathTex(r"\|c_i\| = 1", font_size=26, color=BLUE)
+        step2a = math_tex(r"\|c_i\| = 1", 26, BLUE)
         step2a.next_to(step2_label, DOWN, buff=0.3, aligned_edge=LEFT)
 
-        step2b = MathTex(
-            r"\Rightarrow \arg\min_i \|x - c_i\|^2 = \arg\max_i \langle x, c_i \rangle",
-            font_size=24, color=TEXT_PRIMARY
+        step2b = math_tex(
+            r"\Rightarrow \arg\min_i \|x - c_i\|^2 = \arg\max_i \langle x, c_i \rangle", 24
         )
         step2b.next_to(step2a, DOWN, buff=0.25, aligned_edge=LEFT)
 
@@ -1076,10 +961,7 @@ class MathScene(Scene):
         step3_label = Text("3. ReLU preserves ordering", font_size=20, color=TEXT_SECONDARY)
         step3_label.shift(DOWN * 1.2 + LEFT * 3)
 
-        step3 = MathTex(
-            r"a > b, \, a > 0 \;\Rightarrow\; \text{ReLU}(a) > \text{ReLU}(b)",
-            font_size=24, color=TEXT_PRIMARY
-        )
+        step3 = math_tex(r"a > b, \, a > 0 \;\Rightarrow\; \text{ReLU}(a) > \text{ReLU}(b)", 24)
         step3.next_to(step3_label, DOWN, buff=0.3, aligned_edge=LEFT)
 
         # ReLU image on the right
@@ -1091,7 +973,7 @@ class MathScene(Scene):
         self.play(Write(step3), FadeIn(relu_img, shift=LEFT * 0.2), run_time=0.6)
 
         # QED
-        qed = MathTex(r"\therefore \quad \text{SAE top-1} = \text{k-means}", font_size=28, color=BLUE)
+        qed = math_tex(r"\therefore \quad \text{SAE top-1} = \text{k-means}", 28, BLUE)
         qed.shift(DOWN * 2.8)
         qed_box = SurroundingRectangle(qed, color=BLUE, buff=0.2, stroke_width=2)
 
@@ -0,0 +1,124 @@
+"""
+Per-section and per-animation render profiling
+
+Mix `ProfiledScene` into a scene to record, for every `self.play` call
+(including waits) and every `with self.section(name)` block: wall time,
+frames rendered and mobjects on screen. TeX compile time (from texcache) is
+reported per section only: MathTex objects are built before the `play` that
+shows them, so per-call TeX time would almost always read zero.
+The report is written on tear_down to <media_dir>/profile/<Scene>.json,
+slowest calls first, so expensive animations show up before new assets ship.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import texcache
+
+SLOWEST = 10
+
+
+class ProfiledScene:
+    """Scene mixin; place before Scene in the bases"""
+
+    def setup(self):
+        super().setup()
+        self.profile = {"sections": [], "calls": []}
+        self._section = None
+        self._profile_start = self._counters()
+
+    def _counters(self):
+        return {
+            "wall": time.perf_counter(),
+            "time": self.renderer.time,
+            "tex_ms": texcache.STATS["compile_ms"],
+            "tex_misses": texcache.STATS["misses"],
+        }
+
+    def _delta(self, before, tex=True):
+        from manim import config
+
+        after = self._counters()
+        delta = {
+            "seconds": after["wall"] - before["wall"],
+            "frames": round((after["time"] - before["time"]) * config.frame_rate),
+            "mobjects": len(self.mobjects),
+            "family": len(self.get_mobject_family_members()),
+        }
+        if tex:
+            delta["tex_seconds"] = (after["tex_ms"] - before["tex_ms"]) / 1000
+            delta["tex_compiles"] = after["tex_misses"] - before["tex_misses"]
+        return delta
+
+    @contextmanager
+    def section(self, name):
+        """Attribute everything inside the block to section `name`"""
+        outer, self._section = self._section, name
+        before = self._counters()
+        try:
+            yield
+        finally:
+            self.profile["sections"].append({"section": name, **self._delta(before)})
+            self._section = outer
+
+    @staticmethod
+    def _scene_caller():
+        """First frame outside manim and this module, e.g. the construct() line
+        behind a `self.wait()` rather than Scene.wait"""
+        import manim
+
+        skip = (os.path.dirname(manim.__file__) + os.sep, __file__)
+        frame = sys._getframe(1)
+        while frame.f_back is not None and frame.f_code.co_filename.startswith(skip):
+            frame = frame.f_back
+        return frame
+
+    def _record(self, label, run, *args, **kwargs):
+        caller = self._scene_caller()
+        before = self._counters()
+        result = run(*args, **kwargs)
+        self.profile["calls"].append({
+            "label": label,
+            "section": self._section,
+            "line": caller.f_lineno,
+            "function": caller.f_code.co_name,
+            **self._delta(before, tex=False),
+        })
+        return result
+
+    def play(self, *args, **kwargs):
+        label = ", ".join(type(anim).__name__ for anim in args)
+        # Scene.wait goes through play(Wait(...)), so holds are recorded too
+        return self._record(label, super().play, *args, **kwargs)
+
+    def profile_report(self):
+        calls = self.profile["calls"]
+        total = self._delta(self._profile_start)
+        return {
+            "scene": type(self).__name__,
+            "seconds": total["seconds"],
+            "frames": total["frames"],
+            "tex_seconds": total["tex_seconds"],
+            "tex_compiles": total["tex_compiles"],
+            "sections": self.profile["sections"],
+            "slowest": sorted(calls, key=lambda c: c["seconds"], reverse=True)[:SLOWEST],
+            "calls": calls,
+        }
+
+    def write_profile(self, path=None):
+        from manim import config
+
+        if path is None:
+            path = Path(config.media_dir) / "profile" / f"{type(self).__name__}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.profile_report(), indent=2) + "\n")
+        return path
+
+    def tear_down(self):
+        super().tear_down()
+        self.write_profile()
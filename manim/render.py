@@ -0,0 +1,308 @@
+"""
+Parallel README asset renderer
+
+Each README gif comes from an independent scene, so the scenes are rendered
+by concurrent `manim` processes and the results copied into assets/. A full
+rebuild takes about as long as the slowest scene rather than the sum.
+
+Every scene renders into its own persistent media directory, so concurrent
+processes never write the same partial movie files and manim can reuse the
+partial movies of unchanged animations on the next run. A manifest keyed on
+each scene's source, its dependencies and the render settings skips scenes
+whose gif in assets/ is still current.
+
+Usage:
+    cd manim && python render.py                 # all assets, low quality
+    cd manim && python render.py kmeans sae -q h
+    cd manim && python render.py --force         # ignore the manifest
+    cd manim && python render.py --stream        # pipe frames straight into ffmpeg
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import texcache
+
+MANIM_DIR = Path(__file__).resolve().parent
+ASSETS_DIR = MANIM_DIR.parent / "assets"
+DEFAULT_MEDIA_DIR = MANIM_DIR / "media" / "render"
+SCENE_FILE = MANIM_DIR / "equivalence.py"
+MANIFEST_NAME = "manifest.json"
+PACKAGE_DIR = MANIM_DIR.parent / "sae_kmeans"
+
+# assets/<name>.gif -> scene class in equivalence.py
+SCENES = {
+    "full": "SAEKMeansEquivalence",
+    "kmeans": "KMeansScene",
+    "sae": "SAEScene",
+    "equivalence": "EquivalenceScene",
+    "math": "MathScene",
+}
+QUALITIES = ("l", "m", "h", "p", "k")
+
+
+def manim_command(scene, quality, media_dir, fmt="gif"):
+    return [
+        sys.executable, "-m", "manim", "render",
+        f"-q{quality}", "--format", fmt, "--media_dir", str(media_dir),
+        "--progress_bar", "none",
+        str(SCENE_FILE), scene,
+    ]
+
+
+def find_output(media_dir, scene, fmt="gif"):
+    """Newest rendered file for scene under media_dir"""
+    found = sorted(
+        Path(media_dir).rglob(f"{scene}.{fmt}"),
+        key=lambda p: p.stat().st_mtime,
+    )
+    if not found:
+        raise FileNotFoundError(f"manim produced no {scene}.{fmt} under {media_dir}")
+    return found[-1]
+
+
+# === RENDER CACHE ===
+
+def scene_source(path, scene):
+    """Module-level code of path plus the source of scene and its base classes
+
+    Other scene classes are left out, so editing one scene does not
+    invalidate the others.
+    """
+    text = Path(path).read_text()
+    tree = ast.parse(text)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    parts = [ast.get_source_segment(text, node) for node in tree.body
+             if not isinstance(node, ast.ClassDef)]
+    todo, seen = [scene], set()
+    while todo:
+        name = todo.pop()
+        if name in seen or name not in classes:
+            continue
+        seen.add(name)
+        parts.append(ast.get_source_segment(text, classes[name]))
+        todo.extend(base.id for base in classes[name].bases if isinstance(base, ast.Name))
+    if scene not in seen:
+        raise ValueError(f"{scene} is not defined in {path}")
+    return "\n".join(parts)
+
+
+def local_dependencies(path):
+    """Sibling modules imported by path (transitively) plus the sae_kmeans package
+
+    Derived from the import statements, so a new helper module such as
+    streaming.py or texcache.py invalidates renders as soon as a scene uses it.
+    """
+    found, todo = set(), [Path(path)]
+    while todo:
+        tree = ast.parse(todo.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                top = module.split(".")[0]
+                if top == PACKAGE_DIR.name:
+                    found.update(PACKAGE_DIR.glob("*.py"))
+                dep = MANIM_DIR / f"{top}.py"
+                if dep.exists() and dep not in found:
+                    found.add(dep)
+                    todo.append(dep)
+    found.discard(Path(path))
+    return sorted(found)
+
+
+def _manim_version():
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("manim")
+    except PackageNotFoundError:
+        return None
+
+
+def cache_key(name, quality, fmt="gif", stream=False):
+    """Content hash of everything that determines an asset's pixels"""
+    h = hashlib.sha256()
+    h.update(json.dumps([name, SCENES[name], quality, fmt, stream, _manim_version()]).encode())
+    h.update(scene_source(SCENE_FILE, SCENES[name]).encode())
+    for dep in local_dependencies(SCENE_FILE):
+        h.update(str(dep.relative_to(MANIM_DIR.parent)).encode())
+        h.update(dep.read_bytes())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """JSON manifest: asset -> cache key and digest of the gif it produced"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def is_current(self, name, key, out):
+        """True if out was rendered from key and has not been modified since"""
+        entry = self.entries.get(name)
+        if entry is None or entry["key"] != key or not Path(out).exists():
+            return False
+        return entry["digest"] == file_digest(out)
+
+    def record(self, stats):
+        self.entries[stats["asset"]] = {
+            "key": stats["key"],
+            "digest": file_digest(stats["path"]),
+            "scene": stats["scene"],
+            "quality": stats["quality"],
+        }
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, self.path)
+
+
+# === RENDERING ===
+
+def palette_path(media_root, name, key):
+    """Saved gif palette for one render key, so a changed scene gets a fresh palette"""
+    return Path(media_root) / "palettes" / f"{name}-{key[:16]}.png"
+
+
+def drop_palettes(media_root, name, keep=None):
+    """Delete saved palettes of asset name other than keep"""
+    for path in (Path(media_root) / "palettes").glob(f"{name}-*.png"):
+        if keep is None or path != Path(keep):
+            path.unlink(missing_ok=True)
+
+
+def render_scene(name, quality="l", media_root=DEFAULT_MEDIA_DIR, assets_dir=ASSETS_DIR, key=None,
+                 stream=False):
+    """Render one asset in a child manim process -> stats dict
+
+    With stream=True the scene pipes its frames into ffmpeg and writes the
+    gif in place (see streaming.py) instead of going through movie files.
+    """
+    scene = SCENES[name]
+    media_dir = Path(media_root) / name
+    media_dir.mkdir(parents=True, exist_ok=True)
+    out = Path(assets_dir) / f"{name}.gif"
+    env = dict(os.environ)
+    if stream:
+        from streaming import PALETTE_ENV, STREAM_ENV
+
+        env[STREAM_ENV] = str(out.resolve())
+        palette = palette_path(media_root, name, key or cache_key(name, quality, stream=True))
+        drop_palettes(media_root, name, keep=palette)
+        env[PALETTE_ENV] = str(palette.resolve())
+    start = time.perf_counter()
+    proc = subprocess.run(
+        manim_command(scene, quality, media_dir),
+        cwd=MANIM_DIR, capture_output=True, text=True, env=env,
+    )
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scene} failed (exit {proc.returncode}):\n{proc.stderr[-4000:]}")
+
+    if not stream:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(find_output(media_dir, scene), out)
+    return {"asset": name, "scene": scene, "path": str(out), "seconds": seconds,
+            "quality": quality, "key": key, "cached": False,
+            "profile": str(media_dir / "profile" / f"{scene}.json")}
+
+
+def render_all(names=None, quality="l", workers=None, media_root=DEFAULT_MEDIA_DIR,
+               assets_dir=ASSETS_DIR, force=False, stream=False):
+    """Render assets concurrently; yields stats as each scene finishes
+
+    Each job is a separate manim process, so a thread per job is enough to
+    keep `workers` renders running at once. Assets whose manifest entry
+    matches their current cache key are yielded with cached=True instead.
+    Saved gif palettes are keyed on the cache key, so a stale palette is
+    never reused; force also drops the current one.
+    """
+    names = list(SCENES) if not names else list(names)
+    unknown = [n for n in names if n not in SCENES]
+    if unknown:
+        raise ValueError(f"unknown assets {unknown}, expected some of {list(SCENES)}")
+    if quality not in QUALITIES:
+        raise ValueError(f"quality must be one of {QUALITIES}, got {quality!r}")
+
+    cache = RenderCache(Path(media_root) / MANIFEST_NAME)
+    stale = {}
+    for name in names:
+        key = cache_key(name, quality, stream=stream)
+        out = Path(assets_dir) / f"{name}.gif"
+        if not force and cache.is_current(name, key, out):
+            yield {"asset": name, "scene": SCENES[name], "path": str(out), "seconds": 0.0,
+                   "quality": quality, "key": key, "cached": True}
+        else:
+            stale[name] = key
+            if force:
+                drop_palettes(media_root, name)
+    if not stale:
+        return
+
+    workers = workers or min(len(stale), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(render_scene, name, quality, media_root, assets_dir, key, stream)
+            for name, key in stale.items()
+        ]
+        for future in as_completed(futures):
+            stats = future.result()
+            cache.record(stats)
+            yield stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render README gifs in parallel")
+    parser.add_argument("assets", nargs="*", help=f"subset of {list(SCENES)} (default: all)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-j", "--workers", type=int)
+    parser.add_argument("--media-dir", type=Path, default=DEFAULT_MEDIA_DIR)
+    parser.add_argument("--assets-dir", type=Path, default=ASSETS_DIR)
+    parser.add_argument("--force", action="store_true", help="re-render even if the manifest is current")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream frames into ffmpeg (deduped holds + reused palette) instead of movie files")
+    args = parser.parse_args(argv)
+
+    tex_before = texcache.read_stats()
+    start = time.perf_counter()
+    total = 0.0
+    for stats in render_all(args.assets, quality=args.quality, workers=args.workers,
+                            media_root=args.media_dir, assets_dir=args.assets_dir,
+                            force=args.force, stream=args.stream):
+        total += stats["seconds"]
+        took = "cached" if stats["cached"] else f"{stats['seconds']:.1f}s"
+        print(f"{stats['asset']:>12}: {stats['scene']} {took} -> {stats['path']}", file=sys.stderr)
+    wall = time.perf_counter() - start
+    print(f"rendered in {wall:.1f}s wall ({total:.1f}s summed across scenes)", file=sys.stderr)
+    tex = {k: v - tex_before.get(k, 0) for k, v in texcache.read_stats().items()}
+    if tex:
+        print(f"tex cache: {tex.get('hits', 0)} hits, {tex.get('misses', 0)} misses, "
+              f"{tex.get('compile_ms', 0) / 1000:.1f}s compiling", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
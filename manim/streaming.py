@@ -0,0 +1,170 @@
+"""
+Stream rendered frames straight into ffmpeg
+
+By default manim writes one partial movie per animation, concatenates them
+and leaves the gif/mp4 conversion to a second step. `StreamedScene` swaps in
+a file writer that muxes raw frames with explicit timestamps (NUT, via
+PyAV) into a single ffmpeg process that encodes the final asset directly:
+
+  - a static hold (`self.wait()`, or any run of byte-identical frames) is
+    sent as its first frame plus one closing copy at the hold's last
+    timestamp; with variable frame timing the hold keeps its duration but
+    costs two frames. Frames that differ at all are always sent, so no
+    lossy near-duplicate filter touches slow animations
+  - gifs are quantized with palettegen/paletteuse; the palette is saved on
+    the first run and reused afterwards, so later runs encode in one pass
+    without buffering the video
+
+Enabled by setting SAE_KMEANS_STREAM to the output path (.gif or .mp4),
+e.g. via `python render.py --stream`. Caching is bypassed while streaming,
+since skipped animations would produce no frames.
+"""
+
+import os
+import shutil
+import subprocess
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+from manim import config, logger
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+STREAM_ENV = "SAE_KMEANS_STREAM"
+PALETTE_ENV = "SAE_KMEANS_PALETTE"
+
+GIF_DITHER = "paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle"
+
+
+def ffmpeg_command(out, palette=None):
+    """ffmpeg reading timestamped raw frames (NUT) on stdin and writing out
+
+    For gifs, an existing palette file is reused; otherwise the palette is
+    generated from the stream and, when `palette` is given, saved there too.
+    """
+    out = Path(out)
+    cmd = ["ffmpeg", "-y", "-loglevel", "error", "-f", "nut", "-i", "-"]
+    if out.suffix != ".gif":
+        return cmd + ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart",
+                      "-fps_mode", "vfr", str(out)]
+
+    reuse = palette is not None and Path(palette).exists()
+    save = palette is not None and not reuse
+    if reuse:
+        cmd += ["-i", str(palette)]
+        graph = f"[0:v][1:v]{GIF_DITHER}[out]"
+    else:
+        gen = "palettegen=stats_mode=diff" + (",split[p][keep]" if save else "[p]")
+        graph = f"[0:v]split[a][b];[a]{gen};[b][p]{GIF_DITHER}[out]"
+    cmd += ["-filter_complex", graph, "-map", "[out]", "-fps_mode", "vfr", str(out)]
+    if save:
+        cmd += ["-map", "[keep]", "-frames:v", "1", "-update", "1", str(palette)]
+    return cmd
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """SceneFileWriter that sends every distinct frame to one ffmpeg process"""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.stream_path = Path(os.environ[STREAM_ENV])
+        palette = os.environ.get(PALETTE_ENV)
+        self.palette_path = Path(palette) if palette else None
+        self._process = None
+        self._last = None
+        self._hold_end = None
+        self._pts = 0
+        self.frames_written = 0
+        self.frames_sent = 0
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        pass
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def _start(self, frame):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("streaming export needs the ffmpeg executable on PATH")
+        height, width = frame.shape[:2]
+        self.stream_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.palette_path is not None:
+            self.palette_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.stream_path.with_name(f".{self.stream_path.name}")
+        cmd = ffmpeg_command(self._tmp_path, palette=self.palette_path)
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # One tick per frame at the scene's frame rate
+        self._container = av.open(self._process.stdin, mode="w", format="nut")
+        rate = Fraction(config.frame_rate).limit_denominator(1001)
+        self._stream = self._container.add_stream("rawvideo", rate=rate)
+        self._stream.width, self._stream.height = width, height
+        self._stream.pix_fmt = "rgba"
+        self._stream.time_base = 1 / rate
+
+    def _send(self, frame, pts):
+        video = av.VideoFrame.from_ndarray(frame, format="rgba")
+        video.pts = pts
+        video.time_base = self._stream.time_base
+        for packet in self._stream.encode(video):
+            self._container.mux(packet)
+        self.frames_sent += 1
+
+    def _close_hold(self):
+        # Repeat the held frame at its last timestamp so it keeps its duration
+        if self._hold_end is not None:
+            self._send(self._last, self._hold_end)
+            self._hold_end = None
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not config.write_to_movie:
+            return
+        frame = frame_or_renderer
+        if not isinstance(frame, np.ndarray):
+            frame = frame_or_renderer.get_frame()
+        if self._process is None:
+            self._start(frame)
+        if self._last is not None and np.array_equal(frame, self._last):
+            self._pts += num_frames
+            self._hold_end = self._pts - 1
+        else:
+            self._close_hold()
+            self._last = np.ascontiguousarray(frame).copy()
+            self._send(self._last, self._pts)
+            self._pts += num_frames
+            if num_frames > 1:
+                self._hold_end = self._pts - 1
+        self.frames_written += num_frames
+
+    def finish(self):
+        if self._process is None:
+            return
+        self._close_hold()
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        self._process.stdin.close()
+        stderr = self._process.stderr.read().decode(errors="replace")
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while streaming {self.stream_path}:\n{stderr}")
+        os.replace(self._tmp_path, self.stream_path)
+        logger.info(f"Streamed {self.frames_written} frames ({self.frames_sent} distinct) "
+                    f"to {self.stream_path}")
+
+
+class StreamedScene:
+    """Scene mixin: use StreamingFileWriter when SAE_KMEANS_STREAM is set"""
+
+    def __init__(self, renderer=None, **kwargs):
+        if renderer is None and os.environ.get(STREAM_ENV):
+            renderer = CairoRenderer(
+                file_writer_class=StreamingFileWriter,
+                camera_class=kwargs.get("camera_class"),
+                skip_animations=kwargs.get("skip_animations", False),
+            )
+        super().__init__(renderer=renderer, **kwargs)
@@ -0,0 +1,118 @@
+"""
+Shared TeX -> SVG cache
+
+manim caches compiled TeX per media directory, and render.py gives every
+scene its own media directory, so identical strings (c_i labels, the
+argmin/argmax formulas) were compiled once per scene. `install` routes
+manim's tex_to_svg_file through one content-addressed directory shared by
+all scenes and render processes.
+
+Keys are the TeX string, environment and template body. Font size is not
+part of the key: manim compiles at a fixed size and scales the SVG paths
+afterwards, so every font size reuses the same file.
+
+Writers hold an exclusive flock on a per-key lock file and publish with an
+atomic rename, so concurrent renders compile each string at most once and
+never read a partial SVG.
+"""
+
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "media" / "texcache"
+STATS_NAME = "stats.json"
+
+STATS = Counter()
+_installed = {}
+
+
+@contextmanager
+def _locked(path):
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def tex_key(expression, environment=None, template_body=""):
+    h = hashlib.sha256()
+    h.update(json.dumps([expression, environment, template_body]).encode())
+    return h.hexdigest()
+
+
+def cached_tex_to_svg(compile_svg, cache_dir, expression, environment=None, tex_template=None):
+    """Path of the SVG for expression, compiling with compile_svg only on a miss"""
+    from manim import config
+
+    template = tex_template or config.tex_template
+    key = tex_key(expression, environment, getattr(template, "body", ""))
+    svg = cache_dir / f"{key}.svg"
+    if svg.exists():
+        STATS["hits"] += 1
+        return svg
+
+    with _locked(cache_dir / f"{key}.lock"):
+        # Another process may have compiled it while we waited for the lock
+        if svg.exists():
+            STATS["hits"] += 1
+            return svg
+        start = time.perf_counter()
+        compiled = compile_svg(expression, environment=environment, tex_template=tex_template)
+        tmp = svg.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(compiled, tmp)
+        os.replace(tmp, svg)
+        STATS["misses"] += 1
+        STATS["compile_ms"] += round(1000 * (time.perf_counter() - start))
+    return svg
+
+
+def install(cache_dir=DEFAULT_CACHE_DIR):
+    """Route MathTex/Tex compilation in this process through the shared cache"""
+    import manim.mobject.text.tex_mobject as tex_mobject
+    import manim.utils.tex_file_writing as tex_file_writing
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if _installed.get("cache_dir") == cache_dir:
+        return cache_dir
+    compile_svg = _installed.get("original", tex_file_writing.tex_to_svg_file)
+
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        return cached_tex_to_svg(compile_svg, cache_dir, expression, environment, tex_template)
+
+    # tex_mobject imports the function by name, so patch both references
+    tex_file_writing.tex_to_svg_file = tex_to_svg_file
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+    if not _installed:
+        atexit.register(flush_stats)
+    _installed.update(original=compile_svg, cache_dir=cache_dir)
+    return cache_dir
+
+
+def read_stats(cache_dir=DEFAULT_CACHE_DIR):
+    path = Path(cache_dir) / STATS_NAME
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def flush_stats():
+    """Add this process's hit/miss counts to the cache directory's totals"""
+    cache_dir = _installed.get("cache_dir")
+    if cache_dir is None or not STATS:
+        return
+    with _locked(cache_dir / f"{STATS_NAME}.lock"):
+        totals = Counter(read_stats(cache_dir))
+        totals.update(STATS)
+        tmp = cache_dir / f"{STATS_NAME}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(dict(totals), indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, cache_dir / STATS_NAME)
+    STATS.clear()
@@ -0,0 +1,58 @@
+"""
+SAE ≡ K-Means: executable assignment engine
+"""
+
+from .aio import AsyncAssigner
+from .assign import (
+    assign,
+    cluster_sums,
+    kmeans_assign,
+    normalize,
+    sae_encode,
+    sae_top1,
+    sae_topk,
+    squared_distances,
+    topk_agreement,
+)
+from .blocked import blocked_nearest
+from .encoder import CentroidEncoder
+from .hypotheses import CheckedAssigner
+from .index import IVFIndex
+from .liveness import LiveNeuronTracker
+from .parallel import PartitionedAssigner, ShardedAssigner, merge_top1
+from .quantize import QuantizedEncoder
+from .server import MicroBatcher
+from .store import load_encoder, open_encoder, save_encoder
+from .stream import assign_file, assign_files
+from .train import MiniBatchKMeans, kmeans_plusplus, lloyd_history
+
+__all__ = [
+    "AsyncAssigner",
+    "CentroidEncoder",
+    "CheckedAssigner",
+    "IVFIndex",
+    "LiveNeuronTracker",
+    "MicroBatcher",
+    "MiniBatchKMeans",
+    "PartitionedAssigner",
+    "QuantizedEncoder",
+    "ShardedAssigner",
+    "assign",
+    "assign_file",
+    "assign_files",
+    "blocked_nearest",
+    "cluster_sums",
+    "kmeans_assign",
+    "kmeans_plusplus",
+    "lloyd_history",
+    "load_encoder",
+    "merge_top1",
+    "normalize",
+    "open_encoder",
+    "sae_encode",
+    "sae_top1",
+    "sae_topk",
+    "save_encoder",
+    "squared_distances",
+    "topk_agreement",
+]
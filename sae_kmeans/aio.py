@@ -0,0 +1,132 @@
+"""
+asyncio top-1 assignment with request coalescing
+
+Coroutines `await assigner.assign(x)` for one vector at a time. Requests
+made in the same event-loop iteration, or while a previous batch is still
+computing, are stacked into one batch and run through a single matmul +
+argmax on a background executor. The loop itself never blocks on BLAS, and
+under high concurrency the batches grow, so throughput approaches the
+batched path.
+
+    async with AsyncAssigner(encoder) as assigner:
+        index, value = await assigner.assign(x)
+"""
+
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .encoder import MODES
+
+DEFAULT_MAX_BATCH = 1024
+
+
+class AsyncAssigner:
+    """Coalesce concurrent awaiters into shared `encoder.select` calls
+
+    At most `max_in_flight` batches run at once (one by default, which
+    gives the largest batches); requests arriving meanwhile wait for the
+    next batch. `aclose` (or leaving `async with`) serves every request
+    already queued before shutting the executor down.
+    """
+
+    def __init__(self, encoder, mode="sae", bias=0.0, max_batch=DEFAULT_MAX_BATCH,
+                 max_in_flight=1, executor=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.encoder = encoder
+        self.mode = mode
+        self.bias = bias
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_in_flight,
+                                                       thread_name_prefix="assign")
+        self.batch_sizes = Counter()
+        self._pending = []
+        self._in_flight = 0
+        self._tasks = set()
+        self._scheduled = False
+        self._closed = False
+        self._loop = None
+
+    async def assign(self, x):
+        """Top-1 (index, value) for one (d,) vector"""
+        if self._closed:
+            raise RuntimeError("AsyncAssigner is closed")
+        x = np.asarray(x, dtype=np.float32).ravel()
+        if x.shape[0] != self.encoder.d:
+            raise ValueError(f"expected {self.encoder.d} values, got {x.shape[0]}")
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        self._pending.append((x, future))
+        if not self._scheduled:
+            # Let every coroutine runnable in this iteration enqueue first
+            self._scheduled = True
+            self._loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        self._scheduled = False
+        while self._pending and self._in_flight < self.max_in_flight:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            batch = [(x, f) for x, f in batch if not f.cancelled()]
+            if not batch:
+                continue
+            self._in_flight += 1
+            x = np.stack([x for x, _ in batch])
+            task = self._loop.run_in_executor(
+                self.executor, partial(self.encoder.select, x, mode=self.mode, bias=self.bias)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(partial(self._complete, [f for _, f in batch]))
+
+    def _complete(self, futures, task):
+        self._in_flight -= 1
+        self._tasks.discard(task)
+        self.batch_sizes[len(futures)] += 1
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is None:
+            indices, values = task.result()
+        for i, future in enumerate(futures):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result((int(indices[i]), float(values[i])))
+        if self._pending:
+            self._dispatch()
+
+    def stats(self):
+        sizes = dict(sorted(self.batch_sizes.items()))
+        batches = sum(sizes.values())
+        served = sum(size * count for size, count in sizes.items())
+        return {
+            "requests": served,
+            "batches": batches,
+            "mean_batch": served / max(1, batches),
+            "batch_histogram": {str(size): count for size, count in sizes.items()},
+        }
+
+    async def aclose(self):
+        """Serve queued and in-flight requests, then shut the executor down off-loop"""
+        self._closed = True
+        while self._pending or self._tasks:
+            if self._pending:
+                self._dispatch()
+            if self._tasks:
+                await asyncio.wait(set(self._tasks))
+        if self._owns_executor:
+            # shutdown(wait=True) joins the worker threads; keep that off the loop
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
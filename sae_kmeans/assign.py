@@ -0,0 +1,212 @@
+"""
+Batched k-means / SAE top-1 assignment
+
+Both assignments are computed as one GEMM per row block followed by an
+argmax, so N can be millions of vectors without materialising more than a
+(batch_size, k) score matrix at a time.
+"""
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _as_2d(x):
+    x = np.asarray(x)
+    if x.ndim == 1:
+        x = x[None, :]
+    if x.ndim != 2:
+        raise ValueError(f"expected a (N, d) batch, got shape {x.shape}")
+    return x
+
+
+def _check_dims(x, centroids):
+    if centroids.ndim != 2:
+        raise ValueError(f"expected a (k, d) centroid matrix, got shape {centroids.shape}")
+    if x.shape[1] != centroids.shape[1]:
+        raise ValueError(
+            f"dimension mismatch: x has d={x.shape[1]}, centroids have d={centroids.shape[1]}"
+        )
+
+
+def _result_dtype(x, centroids):
+    # float16 activations are accumulated in float32; asarray first, since
+    # np.result_type reads a raw list as a structured dtype spec
+    return np.promote_types(np.result_type(np.asarray(x), np.asarray(centroids)), np.float32)
+
+
+def normalize(centroids, eps=1e-12):
+    """Scale each centroid to unit norm (the `h_normalized` hypothesis)"""
+    centroids = np.asarray(centroids)
+    centroids = centroids.astype(_result_dtype(centroids, centroids), copy=False)
+    norms = np.linalg.norm(centroids, axis=-1, keepdims=True)
+    return centroids / np.maximum(norms, eps)
+
+
+def squared_distances(x, centroids):
+    """‖x − c_i‖² for every (row, centroid) pair via `distance_decomposition`
+
+    ‖x − c‖² = ‖x‖² − 2⟨x, c⟩ + ‖c‖², so the N×k×d subtraction becomes a
+    single (N, d) @ (d, k) matmul. Clipped at zero against cancellation.
+    """
+    x = _as_2d(x)
+    centroids = _as_2d(centroids)
+    _check_dims(x, centroids)
+    dtype = _result_dtype(x, centroids)
+    x = x.astype(dtype, copy=False)
+    centroids = centroids.astype(dtype, copy=False)
+
+    x_sq = np.einsum("nd,nd->n", x, x)[:, None]
+    c_sq = np.einsum("kd,kd->k", centroids, centroids)[None, :]
+    dists = x @ centroids.T
+    dists *= -2
+    dists += x_sq
+    dists += c_sq
+    return np.maximum(dists, 0, out=dists)
+
+
+def kmeans_assign(x, centroids, batch_size=DEFAULT_BATCH_SIZE):
+    """k-means assignment: argmin_i ‖x − c_i‖² for each row of x
+
+    Returns an int64 array of shape (N,).
+    """
+    x = _as_2d(x)
+    centroids = _as_2d(centroids)
+    _check_dims(x, centroids)
+
+    out = np.empty(x.shape[0], dtype=np.int64)
+    for start in range(0, x.shape[0], batch_size):
+        stop = start + batch_size
+        out[start:stop] = squared_distances(x[start:stop], centroids).argmin(axis=1)
+    return out
+
+
+def sae_encode(x, weights, bias=0.0):
+    """SAE encoder activations z = ReLU(Wx + β) for each row of x"""
+    x = _as_2d(x)
+    weights = _as_2d(weights)
+    _check_dims(x, weights)
+    dtype = _result_dtype(x, weights)
+
+    z = x.astype(dtype, copy=False) @ weights.astype(dtype, copy=False).T
+    z += bias
+    return np.maximum(z, 0, out=z)
+
+
+def sae_top1(x, weights, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+    """SAE top-1 selection: argmax_i ReLU(⟨w_i, x⟩ + β)
+
+    Returns (indices, values): int64 indices and the winning activation per
+    row. Rows whose activations are all zero (the `h_pos` hypothesis fails)
+    report index 0 with value 0.
+    """
+    x = _as_2d(x)
+    weights = _as_2d(weights)
+    _check_dims(x, weights)
+
+    n = x.shape[0]
+    indices = np.empty(n, dtype=np.int64)
+    values = np.empty(n, dtype=_result_dtype(x, weights))
+    rows = np.arange(min(n, batch_size))
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        z = sae_encode(x[start:stop], weights, bias)
+        idx = z.argmax(axis=1)
+        indices[start:stop] = idx
+        values[start:stop] = z[rows[: stop - start], idx]
+    return indices, values
+
+
+def sae_topk(x, weights, top_k, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+    """TopK SAE selection: the top_k largest ReLU(⟨w_i, x⟩ + β) per row
+
+    Returns (indices, values) of shape (N, top_k), ordered by decreasing
+    activation with ties broken by lower index. The winners are found with
+    `np.argpartition` (O(k) per row) and only those top_k are sorted.
+    argpartition picks arbitrary members of a tie at the cut, so rows with
+    more tied values at the cut than it kept are re-selected taking the
+    lowest indices; column 0 therefore always matches `sae_top1`.
+    """
+    x = _as_2d(x)
+    weights = _as_2d(weights)
+    _check_dims(x, weights)
+    k = weights.shape[0]
+    if not 1 <= top_k <= k:
+        raise ValueError(f"top_k must be in [1, {k}], got {top_k}")
+
+    n = x.shape[0]
+    indices = np.empty((n, top_k), dtype=np.int64)
+    values = np.empty((n, top_k), dtype=_result_dtype(x, weights))
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        z = sae_encode(x[start:stop], weights, bias)
+        idx = np.argpartition(z, k - top_k, axis=1)[:, k - top_k:]
+        val = np.take_along_axis(z, idx, axis=1)
+
+        cut = val.min(axis=1)[:, None]
+        at_cut = z == cut
+        tied = at_cut.sum(axis=1) > (val == cut).sum(axis=1)
+        if tied.any():
+            above = z[tied] > cut[tied]
+            room = top_k - above.sum(axis=1)
+            take = above | (at_cut[tied] & (np.cumsum(at_cut[tied], axis=1) <= room[:, None]))
+            idx[tied] = np.nonzero(take)[1].reshape(-1, top_k)
+            val[tied] = np.take_along_axis(z[tied], idx[tied], axis=1)
+        order = np.lexsort((idx, -val), axis=1)
+        indices[start:stop] = np.take_along_axis(idx, order, axis=1)
+        values[start:stop] = np.take_along_axis(val, order, axis=1)
+    return indices, values
+
+
+def topk_agreement(x, centroids, top_k, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+    """Compare TopK selection with the k-means assignment -> (agrees, stats)
+
+    `agrees` marks rows whose top-1 latent is the nearest centroid; stats
+    also reports how often the nearest centroid is anywhere in the top_k.
+    """
+    kmeans_idx = kmeans_assign(x, centroids, batch_size=batch_size)
+    indices, values = sae_topk(x, centroids, top_k, bias=bias, batch_size=batch_size)
+    agrees = indices[:, 0] == kmeans_idx
+    active = values[:, 0] > 0
+    n = len(agrees)
+    stats = {
+        "rows": n,
+        "top_k": top_k,
+        "active_rows": int(active.sum()),
+        "top1_agreement": float(agrees.mean()) if n else 1.0,
+        "top1_agreement_active": float(agrees[active].mean()) if active.any() else 1.0,
+        "nearest_in_topk": float((indices == kmeans_idx[:, None]).any(axis=1).mean()) if n else 1.0,
+        "mean_active_latents": float((values > 0).sum(axis=1).mean()) if n else 0.0,
+    }
+    return agrees, stats
+
+
+def cluster_sums(x, labels, k):
+    """Per-cluster (sums, counts) of the rows of x, the Lloyd update numerator
+
+    Rows are sorted by label once and summed with `np.add.reduceat`, which is
+    much faster than `np.add.at` for large N.
+    """
+    x = _as_2d(x)
+    labels = np.asarray(labels)
+    counts = np.bincount(labels, minlength=k)
+    sums = np.zeros((k, x.shape[1]), dtype=_result_dtype(x, x))
+    if len(labels) == 0:
+        return sums, counts
+    order = np.argsort(labels, kind="stable")
+    present = np.nonzero(counts)[0]
+    starts = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+    sums[present] = np.add.reduceat(x[order].astype(sums.dtype, copy=False), starts, axis=0)
+    return sums, counts
+
+
+def assign(x, centroids, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+    """Run both assignments on the same batch
+
+    Returns (kmeans_indices, sae_indices, sae_values). With unit-norm
+    centroids, zero/constant bias and a positive max activation the two
+    index arrays are identical (`sae_kmeans_equivalence`).
+    """
+    kmeans_idx = kmeans_assign(x, centroids, batch_size=batch_size)
+    sae_idx, sae_values = sae_top1(x, centroids, bias=bias, batch_size=batch_size)
+    return kmeans_idx, sae_idx, sae_values
@@ -0,0 +1,106 @@
+"""
+Cache-blocked nearest-centroid kernel with near-tie correction
+
+`distance_decomposition` turns assignment into a GEMM, but floating point
+error in ⟨x, c⟩ grows with ‖x‖‖c‖ while the gap between the two nearest
+centroids does not, so far from the origin near-ties can flip. Here scores
+⟨x, c⟩ − ½‖c‖² are computed tile by tile (rows × centroids sized to stay in
+L2) with a running top-2; rows whose best-vs-second gap is within the error
+bound are recomputed from direct differences ‖x − c_i‖². Every returned
+distance is also taken from a direct difference, so both the indices and
+the distances are exact up to rounding of the final subtraction.
+"""
+
+import numpy as np
+
+from .assign import _as_2d, _check_dims, _result_dtype
+
+L2_BYTES = 1 << 20
+# Direct-difference recompute works on (rows, k, d) slabs of about this many elements
+DIRECT_ELEMENTS = 1 << 22
+
+
+def tile_shape(n, k, d, itemsize, cache_bytes=L2_BYTES):
+    """(row_block, centroid_block) whose x, c and score tiles fit in cache_bytes"""
+    centroid_block = int(np.clip(cache_bytes // (2 * d * itemsize), 64, max(k, 1)))
+    row_block = int(np.clip(cache_bytes // (2 * (d + centroid_block) * itemsize), 64, max(n, 1)))
+    return row_block, centroid_block
+
+
+def direct_distances(x, centroids):
+    """‖x − c_i‖² by explicit subtraction in float64, no cancellation"""
+    x = np.asarray(x, dtype=np.float64)
+    centroids = np.asarray(centroids, dtype=np.float64)
+    out = np.empty((x.shape[0], centroids.shape[0]))
+    step = max(1, DIRECT_ELEMENTS // max(1, centroids.size))
+    for start in range(0, x.shape[0], step):
+        diff = x[start:start + step, None, :] - centroids[None, :, :]
+        out[start:start + step] = np.einsum("nkd,nkd->nk", diff, diff)
+    return out
+
+
+def blocked_nearest(x, centroids, row_block=None, centroid_block=None, cache_bytes=L2_BYTES):
+    """Exact nearest centroid -> (indices, squared distances, corrected)
+
+    `corrected` marks rows whose GEMM result was within the float error
+    bound of a tie and was recomputed directly. Ties go to the lower index.
+    """
+    x = _as_2d(x)
+    centroids = _as_2d(centroids)
+    _check_dims(x, centroids)
+    n, d = x.shape
+    k = centroids.shape[0]
+    dtype = _result_dtype(x, centroids)
+    auto_rows, auto_cents = tile_shape(n, k, d, np.dtype(dtype).itemsize, cache_bytes)
+    row_block = row_block or auto_rows
+    centroid_block = centroid_block or auto_cents
+
+    c = centroids.astype(dtype, copy=False)
+    half_sq = 0.5 * np.einsum("kd,kd->k", c, c)
+    c_norm_max = float(np.sqrt(2 * half_sq.max())) if k else 0.0
+    eps = np.finfo(dtype).eps
+
+    c64 = None
+    indices = np.empty(n, dtype=np.int64)
+    sq_dists = np.empty(n, dtype=dtype)
+    corrected = np.zeros(n, dtype=bool)
+    for r0 in range(0, n, row_block):
+        r1 = min(r0 + row_block, n)
+        xt = x[r0:r1].astype(dtype, copy=False)
+        rows = np.arange(r1 - r0)
+        best_idx = np.zeros(r1 - r0, dtype=np.int64)
+        best = np.full(r1 - r0, -np.inf, dtype=dtype)
+        second = np.full(r1 - r0, -np.inf, dtype=dtype)
+        for c0 in range(0, k, centroid_block):
+            c1 = min(c0 + centroid_block, k)
+            s = xt @ c[c0:c1].T
+            s -= half_sq[c0:c1]
+            idx = s.argmax(axis=1)
+            top = s[rows, idx]
+            if c1 - c0 > 1:
+                s[rows, idx] = -np.inf
+                runner = s.max(axis=1)
+            else:
+                runner = np.full(r1 - r0, -np.inf, dtype=dtype)
+            # Strict > keeps the earlier (lower-index) block on exact ties
+            better = top > best
+            second = np.where(better, np.maximum(best, runner), np.maximum(second, top))
+            best_idx = np.where(better, idx + c0, best_idx)
+            best = np.where(better, top, best)
+
+        # |error| of each score <= ~d·eps·(‖x‖‖c‖ + ½‖c‖²); a gap within twice
+        # that could be a flipped near-tie
+        x_norm = np.sqrt(np.einsum("nd,nd->n", xt, xt))
+        bound = d * eps * (x_norm * c_norm_max + 0.5 * c_norm_max ** 2)
+        near_tie = best - second <= 2 * bound
+        if near_tie.any():
+            bad = np.nonzero(near_tie)[0]
+            if c64 is None:
+                c64 = np.asarray(centroids, dtype=np.float64)
+            best_idx[bad] = direct_distances(xt[bad], c64).argmin(axis=1)
+            corrected[r0 + bad] = True
+
+        indices[r0:r1] = best_idx
+        diff = np.asarray(xt, dtype=np.float64) - np.asarray(centroids[best_idx], dtype=np.float64)
+        sq_dists[r0:r1] = np.einsum("nd,nd->n", diff, diff)
+    return indices, sq_dists, corrected
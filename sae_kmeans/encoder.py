@@ -0,0 +1,140 @@
+"""
+Centroid encoder with load-time precomputation
+
+For arbitrary (non-normalized) centroids the tex remark gives
+
+    argmin_i ‖x − c_i‖² = argmax_i (⟨x, c_i⟩ − ½‖c_i‖²)
+
+so exact k-means assignment is an SAE with bias b_i = −½‖c_i‖². The bias is
+computed once here; every batch is then a single biased matmul + argmax.
+"""
+
+import numpy as np
+
+from .assign import (
+    DEFAULT_BATCH_SIZE,
+    _as_2d,
+    _check_dims,
+    _result_dtype,
+    normalize as _normalize,
+    sae_top1,
+    sae_topk,
+)
+
+NORM_ATOL = 1e-4
+
+MODES = ("sae", "kmeans")
+
+
+class CentroidEncoder:
+    """(k, d) centroid matrix plus per-centroid norms and k-means bias"""
+
+    def __init__(self, weights, norms=None, bias=None, normalized=None, atol=NORM_ATOL):
+        weights = _as_2d(weights)
+        if not np.issubdtype(weights.dtype, np.floating):
+            weights = weights.astype(np.float32)
+        self.weights = weights
+
+        # Precomputed arrays are accepted as-is so a loader can hand in views
+        if norms is None:
+            norms = np.linalg.norm(weights.astype(_result_dtype(weights, weights)), axis=1)
+        self.norms = norms
+
+        if bias is None:
+            bias = -0.5 * np.square(norms, dtype=_result_dtype(norms, weights))
+        self.bias = bias
+
+        if normalized is None:
+            normalized = bool(np.all(np.abs(norms - 1) <= atol))
+        self.normalized = normalized
+
+    @classmethod
+    def from_centroids(cls, centroids, normalize=False, atol=NORM_ATOL):
+        """Build from raw centroids, optionally projecting them to unit norm"""
+        centroids = _as_2d(centroids)
+        if normalize:
+            centroids = _normalize(centroids)
+        return cls(centroids, atol=atol)
+
+    @property
+    def k(self):
+        return self.weights.shape[0]
+
+    @property
+    def d(self):
+        return self.weights.shape[1]
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(k={self.k}, d={self.d}, "
+            f"dtype={self.weights.dtype}, normalized={self.normalized})"
+        )
+
+    def block(self, start, stop):
+        """Encoder over centroids [start, stop), sharing memory with this one"""
+        return type(self)(
+            self.weights[start:stop],
+            norms=self.norms[start:stop],
+            bias=self.bias[start:stop],
+            normalized=self.normalized or None,
+        )
+
+    def subset(self, rows):
+        """Encoder over the selected centroids (boolean mask or index array)"""
+        return type(self)(
+            self.weights[rows],
+            norms=self.norms[rows],
+            bias=self.bias[rows],
+            normalized=self.normalized or None,
+        )
+
+    def scores(self, x):
+        """Biased scores ⟨x, c_i⟩ − ½‖c_i‖² (argmax = nearest centroid)"""
+        x = _as_2d(x)
+        _check_dims(x, self.weights)
+        dtype = _result_dtype(x, self.weights)
+        s = x.astype(dtype, copy=False) @ self.weights.astype(dtype, copy=False).T
+        s += self.bias
+        return s
+
+    def assign(self, x, batch_size=DEFAULT_BATCH_SIZE):
+        """Exact k-means assignment for arbitrary centroid norms"""
+        x = _as_2d(x)
+        out = np.empty(x.shape[0], dtype=np.int64)
+        for start in range(0, x.shape[0], batch_size):
+            stop = start + batch_size
+            out[start:stop] = self.scores(x[start:stop]).argmax(axis=1)
+        return out
+
+    def nearest(self, x, batch_size=DEFAULT_BATCH_SIZE):
+        """(indices, squared distances) of the nearest centroid per row"""
+        x = _as_2d(x)
+        n = x.shape[0]
+        indices = np.empty(n, dtype=np.int64)
+        sq_dists = np.empty(n, dtype=_result_dtype(x, self.weights))
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            s = self.scores(x[start:stop])
+            idx = s.argmax(axis=1)
+            # ‖x − c‖² = ‖x‖² − 2 (⟨x, c⟩ − ½‖c‖²)
+            best = s[np.arange(stop - start), idx]
+            xb = x[start:stop].astype(s.dtype, copy=False)
+            indices[start:stop] = idx
+            sq_dists[start:stop] = np.maximum(np.einsum("nd,nd->n", xb, xb) - 2 * best, 0)
+        return indices, sq_dists
+
+    def top1(self, x, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+        """SAE top-1 (indices, values) with the centroids as encoder rows"""
+        return sae_top1(x, self.weights, bias=bias, batch_size=batch_size)
+
+    def topk(self, x, top_k, bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+        """TopK SAE (indices, values), each (N, top_k), in decreasing order"""
+        return sae_topk(x, self.weights, top_k, bias=bias, batch_size=batch_size)
+
+    def select(self, x, mode="sae", bias=0.0, batch_size=DEFAULT_BATCH_SIZE):
+        """Dispatch on mode: SAE top-1 activations or k-means distances"""
+        if mode == "sae":
+            return self.top1(x, bias=bias, batch_size=batch_size)
+        if mode == "kmeans":
+            return self.nearest(x, batch_size=batch_size)
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
@@ -0,0 +1,93 @@
+"""
+Runtime hypothesis checks for the SAE top-1 fast path
+
+`sae_kmeans_equivalence` needs
+  h_normalized  ‖c_i‖ = 1 for every centroid   (checked once, at load)
+  h_pos         max_i ⟨c_i, x⟩ + β > 0         (checked per row)
+and the bias must be constant (`sae_kmeans_with_constant_bias`). Rows that
+pass take the matmul + argmax path; rows that fail, or whose top-two gap is
+within the norm tolerance plus the float error of the matmul, are recomputed
+from direct differences ‖x − c_i‖², so every row is the k-means assignment.
+"""
+
+import numpy as np
+
+from .assign import DEFAULT_BATCH_SIZE, _as_2d, _check_dims, _result_dtype
+from .blocked import blocked_nearest, direct_distances
+from .encoder import NORM_ATOL
+
+
+class CheckedAssigner:
+    """SAE top-1 that falls back to ‖x − c_i‖² for rows violating the hypotheses
+
+    Centroid norms within `atol` of 1 are accepted; the resulting error in
+    ½‖c_i‖² is carried as `slack`. Rows whose top-two gap is within twice
+    the slack plus the rounding error of ⟨x, c_i⟩ (~d·eps·‖x‖‖c‖, as in
+    `blocked_nearest`) are treated as failing too, so neither the tolerance
+    nor float error flips an assignment.
+    """
+
+    def __init__(self, encoder, bias=0.0, atol=NORM_ATOL):
+        self.encoder = encoder
+        self.bias = bias
+        norms = np.asarray(encoder.norms, dtype=np.float64)
+        self.normalized = bool(np.all(np.abs(norms - 1) <= atol))
+        self.constant_bias = np.ndim(bias) == 0 or bool(np.all(np.asarray(bias) == np.ravel(bias)[0]))
+        # max_i |½‖c_i‖² − ½|: how far the normalized argmax can be off
+        self.slack = float(np.max(np.abs(0.5 * norms ** 2 - 0.5))) if len(norms) else 0.0
+        self.c_norm_max = float(norms.max()) if len(norms) else 0.0
+        self.fast_path = self.normalized and self.constant_bias
+        self.last_stats = None
+
+    def assign(self, x, batch_size=DEFAULT_BATCH_SIZE):
+        """(indices, fallback) where fallback marks rows that took the distance path"""
+        x = _as_2d(x)
+        _check_dims(x, self.encoder.weights)
+        n = x.shape[0]
+        indices = np.empty(n, dtype=np.int64)
+        fallback = np.zeros(n, dtype=bool)
+
+        if not self.fast_path:
+            # h_normalized (or constant bias) fails for the whole matrix: the
+            # biased matmul with near-tie correction is exact for arbitrary norms
+            indices[:] = blocked_nearest(x, self.encoder.weights)[0]
+            fallback[:] = True
+            self.last_stats = {"rows": n, "fallback_rows": n, "fast_path": False}
+            return indices, fallback
+
+        dtype = _result_dtype(x, self.encoder.weights)
+        eps = np.finfo(dtype).eps
+        d = x.shape[1]
+        bias_max = float(np.max(np.abs(self.bias))) if np.size(self.bias) else 0.0
+        weights_t = self.encoder.weights.T.astype(dtype, copy=False)
+        rows = np.arange(min(n, batch_size))
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            chunk = x[start:stop].astype(dtype, copy=False)
+            z = chunk @ weights_t
+            z += self.bias
+            idx = z.argmax(axis=1)
+            best = z[rows[: stop - start], idx]
+
+            # |error| of each score <= ~d·eps·(‖x‖‖c‖ + |β|)
+            x_norm = np.sqrt(np.einsum("nd,nd->n", chunk, chunk))
+            err = d * eps * (x_norm * self.c_norm_max + bias_max)
+            failing = best <= err
+            if z.shape[1] > 1:
+                second = np.partition(z, -2, axis=1)[:, -2]
+                failing |= best - second <= 2 * (self.slack + err)
+
+            if failing.any():
+                bad = np.nonzero(failing)[0]
+                idx[bad] = direct_distances(chunk[bad], self.encoder.weights).argmin(axis=1)
+            indices[start:stop] = idx
+            fallback[start:stop] = failing
+
+        self.last_stats = {
+            "rows": n,
+            "fallback_rows": int(fallback.sum()),
+            "fast_path": True,
+        }
+        return indices, fallback
+
+    __call__ = assign
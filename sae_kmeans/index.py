@@ -0,0 +1,126 @@
+"""
+Approximate nearest-centroid index (inverted file)
+
+With unit-norm centroids, k-means assignment is maximum inner product
+search over the encoder rows. The rows are grouped into `n_lists` buckets
+by a spherical k-means coarse quantizer; a query scores only the buckets of
+its `n_probe` best coarse centers, then re-ranks every candidate in those
+buckets exactly. `n_probe` trades recall for latency: n_probe = n_lists
+is the brute-force scan.
+"""
+
+import numpy as np
+
+from .assign import _as_2d, _check_dims, _result_dtype, cluster_sums, normalize
+from .encoder import MODES
+
+
+def train_coarse(weights, n_lists, iters=10, seed=0):
+    """Spherical k-means over the encoder rows -> (n_lists, d) unit centers"""
+    rng = np.random.default_rng(seed)
+    directions = normalize(weights)
+    k = directions.shape[0]
+    centers = directions[rng.choice(k, size=n_lists, replace=False)]
+    for _ in range(iters):
+        labels = (directions @ centers.T).argmax(axis=1)
+        sums, counts = cluster_sums(directions, labels, n_lists)
+        empty = counts == 0
+        # Reseed empty buckets from random rows
+        sums[empty] = directions[rng.choice(k, size=int(empty.sum()), replace=False)]
+        centers = normalize(sums)
+    labels = (directions @ centers.T).argmax(axis=1)
+    return centers, labels
+
+
+class IVFIndex:
+    """Inverted-file top-1 search over a CentroidEncoder
+
+    Ranking is the same as the brute-force path for the chosen mode, so for
+    every probed candidate the score is exact; only centroids in unprobed
+    buckets can be missed.
+    """
+
+    def __init__(self, encoder, n_lists=None, n_probe=1, mode="sae", bias=0.0, iters=10, seed=0):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.encoder = encoder
+        self.mode = mode
+        self.bias = bias
+        self.n_lists = min(encoder.k, n_lists or max(1, int(round(np.sqrt(encoder.k)))))
+        self.n_probe = n_probe
+
+        self.centers, labels = train_coarse(encoder.weights, self.n_lists, iters=iters, seed=seed)
+        # Bucket members stored contiguously (ascending global index within a bucket)
+        self.order = np.argsort(labels, kind="stable")
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=self.n_lists))))
+        self.weights = np.ascontiguousarray(encoder.weights[self.order])
+        rank_bias = encoder.bias if mode == "kmeans" else np.broadcast_to(bias, (encoder.k,))
+        self.rank_bias = np.asarray(rank_bias)[self.order]
+
+        self.last_candidates = None
+
+    def probe(self, x, n_probe=None):
+        """(N, n_probe) bucket ids with the highest coarse inner product"""
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        coarse = x @ self.centers.T.astype(x.dtype, copy=False)
+        if n_probe == self.n_lists:
+            return np.broadcast_to(np.arange(self.n_lists), coarse.shape)
+        return np.argpartition(-coarse, n_probe - 1, axis=1)[:, :n_probe]
+
+    def search(self, x, n_probe=None):
+        """(indices, values) like `CentroidEncoder.select`, probing n_probe buckets"""
+        x = _as_2d(x)
+        _check_dims(x, self.weights)
+        x = x.astype(_result_dtype(x, self.weights), copy=False)
+        n = x.shape[0]
+        probes = self.probe(x, n_probe)
+
+        best_idx = np.zeros(n, dtype=np.int64)
+        best_val = np.full(n, -np.inf, dtype=x.dtype)
+        candidates = np.zeros(n, dtype=np.int64)
+
+        # Group queries by bucket so each bucket is one small GEMM
+        flat = probes.ravel()
+        queries = np.repeat(np.arange(n), probes.shape[1])
+        by_bucket = np.argsort(flat, kind="stable")
+        bucket_starts = np.searchsorted(flat[by_bucket], np.arange(self.n_lists + 1))
+        for bucket in range(self.n_lists):
+            rows = queries[by_bucket[bucket_starts[bucket]:bucket_starts[bucket + 1]]]
+            lo, hi = self.offsets[bucket], self.offsets[bucket + 1]
+            if len(rows) == 0 or lo == hi:
+                continue
+            s = x[rows] @ self.weights[lo:hi].T.astype(x.dtype, copy=False)
+            s += self.rank_bias[lo:hi]
+            local = s.argmax(axis=1)
+            val = s[np.arange(len(rows)), local]
+            idx = self.order[lo + local]
+            # Ties resolve to the lowest global index, as brute-force argmax does
+            better = (val > best_val[rows]) | ((val == best_val[rows]) & (idx < best_idx[rows]))
+            best_val[rows[better]] = val[better]
+            best_idx[rows[better]] = idx[better]
+            candidates[rows] += hi - lo
+        self.last_candidates = candidates
+
+        if self.mode == "sae":
+            values = np.maximum(best_val, 0)
+            # All-zero activations report index 0, as in sae_top1
+            best_idx[values == 0] = 0
+        else:
+            values = np.maximum(np.einsum("nd,nd->n", x, x) - 2 * best_val, 0)
+        return best_idx, values
+
+    __call__ = search
+
+    def agreement(self, x, n_probe=None, reference=None):
+        """Fraction of rows whose indexed assignment matches brute force,
+        plus mean candidates scored per query (the latency proxy)"""
+        if reference is None:
+            reference = self.encoder.select(_as_2d(x), mode=self.mode, bias=self.bias)[0]
+        indices, _ = self.search(x, n_probe)
+        return {
+            "n_probe": min(n_probe or self.n_probe, self.n_lists),
+            "n_lists": self.n_lists,
+            "agreement": float(np.mean(indices == reference)),
+            "mean_candidates": float(self.last_candidates.mean()),
+            "candidate_fraction": float(self.last_candidates.mean() / self.encoder.k),
+        }
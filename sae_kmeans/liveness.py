@@ -0,0 +1,101 @@
+"""
+Live neuron tracking and automatic k selection
+
+Each batch of top-1 indices costs one `np.bincount` (O(N + k)). A latent is
+live if it has won the argmax recently enough; the live count is the
+data-driven k. Dead latents can be pruned (dropped) or merged (their index
+redirected to the nearest live latent), shrinking the encoder matrix and
+with it the O(kd) cost per token.
+"""
+
+import numpy as np
+
+
+class LiveNeuronTracker:
+    """Per-latent win counts and recency over a stream of top-1 indices"""
+
+    def __init__(self, k, horizon=None, min_count=1):
+        self.k = k
+        self.horizon = horizon
+        self.min_count = min_count
+        self.counts = np.zeros(k, dtype=np.int64)
+        # Rows seen when the latent last won (-1 = never), at batch granularity
+        self.last_win = np.full(k, -1, dtype=np.int64)
+        self.rows_seen = 0
+
+    def update(self, indices, active=None):
+        """Record a batch of winners; `active` masks rows whose top-1 was all-zero"""
+        indices = np.asarray(indices).ravel()
+        if active is not None:
+            indices = indices[np.asarray(active).ravel()]
+        batch = np.bincount(indices, minlength=self.k)
+        self.counts += batch
+        self.rows_seen += len(indices)
+        self.last_win[batch > 0] = self.rows_seen
+        return self
+
+    def live_mask(self, horizon=None, min_count=None):
+        """Latents with at least min_count wins, the last within `horizon` rows"""
+        horizon = self.horizon if horizon is None else horizon
+        min_count = self.min_count if min_count is None else min_count
+        live = self.counts >= min_count
+        if horizon is not None:
+            live &= self.last_win > self.rows_seen - horizon
+        return live
+
+    def dead(self, **kwargs):
+        return np.nonzero(~self.live_mask(**kwargs))[0]
+
+    @property
+    def live_count(self):
+        """Automatic k: the number of latents currently live"""
+        return int(self.live_mask().sum())
+
+    def summary(self):
+        live = self.live_mask()
+        return {
+            "k": self.k,
+            "live": int(live.sum()),
+            "dead": int((~live).sum()),
+            "rows_seen": self.rows_seen,
+            "max_share": float(self.counts.max() / max(1, self.rows_seen)),
+        }
+
+    # === SHRINKING THE ENCODER ===
+
+    def prune(self, encoder, **kwargs):
+        """Drop dead latents -> (encoder, remap); remap[old] = new index or -1"""
+        live = self.live_mask(**kwargs)
+        remap = np.full(self.k, -1, dtype=np.int64)
+        remap[live] = np.arange(int(live.sum()))
+        self._compact(live, remap)
+        return encoder.subset(live), remap
+
+    def merge(self, encoder, **kwargs):
+        """Redirect dead latents to their nearest live latent -> (encoder, remap)
+
+        Unlike `prune`, every old index maps to a live one, so stored
+        assignments stay valid after the encoder shrinks.
+        """
+        live = self.live_mask(**kwargs)
+        if not live.any():
+            raise ValueError("no live latents to merge into")
+        shrunk = encoder.subset(live)
+        remap = np.empty(self.k, dtype=np.int64)
+        remap[live] = np.arange(int(live.sum()))
+        dead = ~live
+        if dead.any():
+            # Exact nearest live centroid for each dead centroid
+            remap[dead] = shrunk.assign(encoder.weights[dead])
+        self._compact(live, remap)
+        return shrunk, remap
+
+    def _compact(self, live, remap):
+        mapped = remap >= 0
+        counts = np.bincount(remap[mapped], weights=self.counts[mapped],
+                             minlength=int(live.sum())).astype(np.int64)
+        last_win = np.full(len(counts), -1, dtype=np.int64)
+        np.maximum.at(last_win, remap[mapped], self.last_win[mapped])
+        self.k = len(counts)
+        self.counts = counts
+        self.last_win = last_win
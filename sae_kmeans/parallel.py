@@ -0,0 +1,398 @@
+"""
+Multi-core sharded assignment
+
+`ShardedAssigner` splits the N axis into contiguous shards, one task per
+shard. Every shard walks its rows in `DEFAULT_BATCH_SIZE` blocks and writes
+its indices and values straight into its slice of a preallocated output, so
+there is no merge step. The process backend's output blocks are reused by
+the next call, so the result is copied out of shared memory once at the end.
+
+`PartitionedAssigner` splits the k axis instead, for dictionaries too large
+to stream through cache in one GEMM: each worker scores its block of
+centroids, returns a local (value, index) top-1 and the blocks are reduced
+into the global argmax.
+
+  thread   numpy matmuls release the GIL, so threads scale as long as BLAS
+           itself is single-threaded (OMP_NUM_THREADS=1 / OPENBLAS_NUM_THREADS=1)
+  process  input, weights and outputs live in multiprocessing.shared_memory;
+           workers attach by name and never receive array data via pickle
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .assign import DEFAULT_BATCH_SIZE, _as_2d, _check_dims
+from .encoder import MODES, CentroidEncoder
+
+BACKENDS = ("thread", "process")
+MIN_SHARD_ROWS = 1024
+MIN_BLOCK_CENTROIDS = 4096
+
+
+def shard_bounds(n, shards, min_rows=MIN_SHARD_ROWS):
+    """Contiguous [start, stop) ranges covering n rows"""
+    shards = max(1, min(shards, -(-n // min_rows) if n else 1))
+    edges = np.linspace(0, n, shards + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _output_dtypes(encoder, x):
+    index_dtype = np.int32 if encoder.k <= np.iinfo(np.int32).max else np.int64
+    return index_dtype, np.promote_types(np.result_type(x, encoder.weights), np.float32)
+
+
+# === PROCESS BACKEND ===
+# Workers attach to shared blocks by name; attachments are cached per process
+# until the parent replaces the block (a grown buffer gets a new name).
+
+_worker_encoder = None
+_worker_weights_spec = None
+_worker_blocks = {}
+_worker_partitions = {}
+
+
+def _attach(name, shape, dtype, offset=0):
+    if name not in _worker_blocks:
+        _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=_worker_blocks[name].buf, offset=offset)
+
+
+def _release_stale(*specs):
+    """Close cached attachments to blocks the current task no longer uses"""
+    current = {spec[0] for spec in specs}
+    for name in [name for name in _worker_blocks if name not in current]:
+        _worker_blocks.pop(name).close()
+
+
+def _init_process_worker(weights_spec):
+    global _worker_encoder, _worker_weights_spec
+    _worker_weights_spec = weights_spec
+    _worker_encoder = CentroidEncoder(_attach(*weights_spec))
+
+
+def _process_shard(x_spec, idx_spec, val_spec, start, stop, mode, bias):
+    busy = time.perf_counter()
+    _release_stale(_worker_weights_spec, x_spec, idx_spec, val_spec)
+    x = _attach(*x_spec)
+    idx, val = _worker_encoder.select(x[start:stop], mode=mode, bias=bias)
+    _attach(*idx_spec)[start:stop] = idx
+    _attach(*val_spec)[start:stop] = val
+    return os.getpid(), stop - start, time.perf_counter() - busy
+
+
+def _local_top1(encoder, x, mode, bias, batch_size=DEFAULT_BATCH_SIZE):
+    """Block-local (indices, values); values are what the global argmax ranks
+
+    sae: ReLU(⟨w_i, x⟩ + bias), kmeans: ⟨x, c_i⟩ − ½‖c_i‖²
+    """
+    if mode == "sae":
+        return encoder.top1(x, bias=bias, batch_size=batch_size)
+    n = x.shape[0]
+    indices = np.empty(n, dtype=np.int64)
+    values = np.empty(n, dtype=_output_dtypes(encoder, x)[1])
+    rows = np.arange(min(n, batch_size))
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        s = encoder.scores(x[start:stop])
+        idx = s.argmax(axis=1)
+        indices[start:stop] = idx
+        values[start:stop] = s[rows[: stop - start], idx]
+    return indices, values
+
+
+def _block_bias(bias, start, stop):
+    """The part of a scalar or per-latent bias that applies to centroids [start, stop)"""
+    return bias if np.ndim(bias) == 0 else np.asarray(bias)[start:stop]
+
+
+def _process_block(x_spec, weights_spec, start, stop, mode, bias):
+    busy = time.perf_counter()
+    _release_stale(weights_spec, x_spec)
+    key = (weights_spec[0], start, stop)
+    if key not in _worker_partitions:
+        _worker_partitions[key] = CentroidEncoder(_attach(*weights_spec)[start:stop])
+    idx, val = _local_top1(_worker_partitions[key], _attach(*x_spec), mode,
+                           _block_bias(bias, start, stop))
+    return os.getpid(), stop - start, time.perf_counter() - busy, idx, val
+
+
+def _thread_block(encoder, x, start, stop, mode, bias):
+    busy = time.perf_counter()
+    idx, val = _local_top1(encoder.block(start, stop), x, mode, _block_bias(bias, start, stop))
+    return threading.get_ident(), stop - start, time.perf_counter() - busy, idx, val
+
+
+def merge_top1(partials):
+    """Exact reduction of per-block (offset, indices, values) into the global argmax
+
+    Blocks are merged in centroid order with a strict comparison, so ties
+    resolve to the lowest global index exactly as a single `argmax` would.
+    """
+    partials = iter(partials)
+    offset, best_idx, best_val = next(partials)
+    best_idx = best_idx + offset
+    best_val = best_val.copy()
+    for offset, idx, val in partials:
+        better = val > best_val
+        best_idx[better] = idx[better] + offset
+        best_val[better] = val[better]
+    return best_idx, best_val
+
+
+def _thread_shard(encoder, x, indices, values, start, stop, mode, bias):
+    busy = time.perf_counter()
+    idx, val = encoder.select(x[start:stop], mode=mode, bias=bias)
+    indices[start:stop] = idx
+    values[start:stop] = val
+    return threading.get_ident(), stop - start, time.perf_counter() - busy
+
+
+def _pool_stats(assigner, results, n, wall):
+    """Aggregate per-task (worker, units, busy_s, ...) into per-worker utilization"""
+    per_worker = {}
+    for worker, units, busy, *_ in results:
+        entry = per_worker.setdefault(
+            worker, {"worker": worker, "units": 0, "busy_s": 0.0, "tasks": 0}
+        )
+        entry["units"] += int(units)
+        entry["busy_s"] += busy
+        entry["tasks"] += 1
+    for entry in per_worker.values():
+        entry["utilization"] = entry["busy_s"] / wall if wall > 0 else 0.0
+    return {
+        "backend": assigner.backend,
+        "workers": assigner.workers,
+        "rows": n,
+        "wall_s": wall,
+        "rows_per_s": n / wall if wall > 0 else float("inf"),
+        "per_worker": list(per_worker.values()),
+    }
+
+
+class _SharedBuffer:
+    """Growable shared-memory block reused across calls"""
+
+    def __init__(self):
+        self.block = None
+
+    def view(self, shape, dtype):
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        if self.block is None or self.block.size < nbytes:
+            self.close()
+            self.block = shared_memory.SharedMemory(create=True, size=nbytes)
+        spec = (self.block.name, tuple(shape), np.dtype(dtype).str, 0)
+        return np.ndarray(shape, dtype=dtype, buffer=self.block.buf), spec
+
+    def locate(self, arr):
+        """(spec addressing arr in place or None, whether arr overlaps this block)
+
+        A C-contiguous array lying inside the block (e.g. a row slice of an
+        `input_buffer`) is addressed by its byte offset, so workers read it
+        without a copy and nothing else in the block is overwritten.
+        """
+        if self.block is None:
+            return None, False
+        base = np.frombuffer(self.block.buf, dtype=np.uint8)
+        if not np.shares_memory(arr, base):
+            return None, False
+        offset = arr.__array_interface__["data"][0] - base.__array_interface__["data"][0]
+        if not arr.flags.c_contiguous or offset < 0 or offset + arr.nbytes > self.block.size:
+            return None, True
+        return (self.block.name, arr.shape, arr.dtype.str, offset), True
+
+    def close(self):
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+
+class ShardedAssigner:
+    """Top-1 / k-means assignment split over a pool of workers
+
+    After each call `last_stats` holds wall time and, per worker, units of
+    work (rows), busy seconds and utilization (busy / wall).
+    """
+
+    def __init__(self, encoder, workers=None, backend="thread", mode="sae", bias=0.0,
+                 min_shard_rows=MIN_SHARD_ROWS):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.encoder = encoder
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.mode = mode
+        self.bias = bias
+        self.min_shard_rows = min_shard_rows
+        self.last_stats = None
+
+        if backend == "thread":
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="sae-shard")
+            self._buffers = None
+        else:
+            self._buffers = {name: _SharedBuffer() for name in ("weights", "x", "indices", "values")}
+            weights, spec = self._buffers["weights"].view(encoder.weights.shape, encoder.weights.dtype)
+            weights[...] = encoder.weights
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_process_worker, initargs=(spec,)
+            )
+
+    def __call__(self, x):
+        return self.assign(x)
+
+    def input_buffer(self, shape, dtype=np.float32):
+        """Shared-memory array to fill in place; passing it (or a contiguous
+        row slice of it) to `assign` skips the copy into shared memory
+        (process backend only)"""
+        if self.backend != "process":
+            return np.empty(shape, dtype=dtype)
+        return self._buffers["x"].view(shape, dtype)[0]
+
+    def assign(self, x):
+        """(indices, values) for every row of x"""
+        x = _as_2d(x)
+        _check_dims(x, self.encoder.weights)
+        n = x.shape[0]
+        index_dtype, value_dtype = _output_dtypes(self.encoder, x)
+        bounds = shard_bounds(n, self.workers, self.min_shard_rows)
+
+        start_time = time.perf_counter()
+        if self.backend == "thread":
+            indices = np.empty(n, dtype=index_dtype)
+            values = np.empty(n, dtype=value_dtype)
+            futures = [
+                self._pool.submit(_thread_shard, self.encoder, x, indices, values,
+                                  start, stop, self.mode, self.bias)
+                for start, stop in bounds
+            ]
+        else:
+            x_spec, overlaps = self._buffers["x"].locate(x)
+            if x_spec is None:
+                # A strided view into the input buffer must not be copied over
+                # the caller's data there, so it goes through a scratch block
+                if overlaps:
+                    target = self._buffers.setdefault("scratch", _SharedBuffer())
+                else:
+                    target = self._buffers["x"]
+                shared_x, x_spec = target.view(x.shape, x.dtype)
+                shared_x[...] = x
+            indices, idx_spec = self._buffers["indices"].view((n,), index_dtype)
+            values, val_spec = self._buffers["values"].view((n,), value_dtype)
+            futures = [
+                self._pool.submit(_process_shard, x_spec, idx_spec, val_spec,
+                                  start, stop, self.mode, self.bias)
+                for start, stop in bounds
+            ]
+        results = [f.result() for f in futures]
+        wall = time.perf_counter() - start_time
+
+        if self.backend == "process":
+            # The shared blocks are reused by the next call
+            indices, values = indices.copy(), values.copy()
+
+        self.last_stats = _pool_stats(self, results, n, wall)
+        return indices, values
+
+    def close(self):
+        self._pool.shutdown()
+        if self._buffers:
+            for buffer in self._buffers.values():
+                buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PartitionedAssigner:
+    """Top-1 / k-means assignment with the centroid matrix split across workers
+
+    Each task scores the whole batch against one contiguous block of
+    centroids; `merge_top1` then reduces the local winners. The reduction is
+    exact: the result equals argmax over the full score row computed
+    block by block. `last_stats` units are centroids scored per task.
+    """
+
+    def __init__(self, encoder, workers=None, blocks=None, backend="thread", mode="sae",
+                 bias=0.0, min_block=MIN_BLOCK_CENTROIDS):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.encoder = encoder
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.mode = mode
+        self.bias = bias
+        self.bounds = shard_bounds(encoder.k, blocks or self.workers, min_block)
+        self.last_stats = None
+
+        if backend == "thread":
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="sae-block")
+            self._buffers = None
+        else:
+            self._buffers = {name: _SharedBuffer() for name in ("weights", "x")}
+            weights, self._weights_spec = self._buffers["weights"].view(
+                encoder.weights.shape, encoder.weights.dtype
+            )
+            weights[...] = encoder.weights
+            self._pool = ProcessPoolExecutor(self.workers)
+
+    def __call__(self, x):
+        return self.assign(x)
+
+    def assign(self, x):
+        """(indices, values) for every row of x, identical to the unpartitioned path"""
+        x = _as_2d(x)
+        _check_dims(x, self.encoder.weights)
+        n = x.shape[0]
+        index_dtype, _ = _output_dtypes(self.encoder, x)
+
+        start_time = time.perf_counter()
+        if self.backend == "thread":
+            futures = [
+                self._pool.submit(_thread_block, self.encoder, x, start, stop, self.mode, self.bias)
+                for start, stop in self.bounds
+            ]
+        else:
+            shared_x, x_spec = self._buffers["x"].view(x.shape, x.dtype)
+            shared_x[...] = x
+            futures = [
+                self._pool.submit(_process_block, x_spec, self._weights_spec,
+                                  start, stop, self.mode, self.bias)
+                for start, stop in self.bounds
+            ]
+        results = [f.result() for f in futures]
+        indices, values = merge_top1(
+            (start, idx, val) for (start, _), (*_, idx, val) in zip(self.bounds, results)
+        )
+        wall = time.perf_counter() - start_time
+
+        if self.mode == "kmeans":
+            # best biased score -> squared distance
+            xf = x.astype(values.dtype, copy=False)
+            values = np.maximum(np.einsum("nd,nd->n", xf, xf) - 2 * values, 0)
+
+        self.last_stats = _pool_stats(self, results, n, wall)
+        return indices.astype(index_dtype, copy=False), values
+
+    def close(self):
+        self._pool.shutdown()
+        if self._buffers:
+            for buffer in self._buffers.values():
+                buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
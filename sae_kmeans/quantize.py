@@ -0,0 +1,182 @@
+"""
+Reduced-precision encoder storage with margin-aware exact re-rank
+
+The centroid matrix is stored as float16, bfloat16 (upper half of float32,
+kept as uint16 since numpy has no bfloat16) or per-row symmetric int8.
+Scoring walks cache-sized (rows × centroids) tiles from `blocked.tile_shape`:
+each centroid tile is dequantized into a float32 block small enough to stay
+in L2 and consumed by the GEMM straight away, so per row tile only the
+compressed weights (2-4x fewer bytes) are streamed from memory. The price
+is dequantizing every centroid tile once per row tile.
+
+Quantization moves each score by at most ‖x‖·‖c_i − ĉ_i‖ (Cauchy-Schwarz).
+Rows whose top-two margin is within twice that bound could rank differently
+at full precision; only those rows are re-scored against the float32
+reference weights, so assignments match the full-precision result.
+"""
+
+import numpy as np
+
+from .assign import DEFAULT_BATCH_SIZE, _as_2d, _check_dims
+from .blocked import L2_BYTES, tile_shape
+from .encoder import MODES
+
+FORMATS = ("float16", "bfloat16", "int8")
+
+
+def _to_bfloat16(w):
+    bits = np.ascontiguousarray(w, dtype=np.float32).view(np.uint32)
+    # round to nearest even on the dropped 16 bits
+    bits = bits + np.uint32(0x7FFF) + ((bits >> np.uint32(16)) & np.uint32(1))
+    return (bits >> np.uint32(16)).astype(np.uint16)
+
+
+def _from_bfloat16(q):
+    return (q.astype(np.uint32) << np.uint32(16)).view(np.float32)
+
+
+def quantize(weights, fmt):
+    """-> (storage array, per-row scale or None)"""
+    weights = np.asarray(weights, dtype=np.float32)
+    if fmt == "float16":
+        return weights.astype(np.float16), None
+    if fmt == "bfloat16":
+        return _to_bfloat16(weights), None
+    if fmt == "int8":
+        scale = np.abs(weights).max(axis=1) / 127
+        scale[scale == 0] = 1
+        q = np.clip(np.rint(weights / scale[:, None]), -127, 127).astype(np.int8)
+        return q, scale.astype(np.float32)
+    raise ValueError(f"format must be one of {FORMATS}, got {fmt!r}")
+
+
+def dequantize(q, scale, fmt):
+    if fmt == "float16":
+        return q.astype(np.float32)
+    if fmt == "bfloat16":
+        return _from_bfloat16(q)
+    return q.astype(np.float32) * scale[:, None]
+
+
+class QuantizedEncoder:
+    """Low-precision copy of a CentroidEncoder with exact top-1 via re-rank
+
+    The reference encoder is only read for the flagged rows; it can be a
+    memory-mapped, cold copy.
+    """
+
+    def __init__(self, encoder, fmt="bfloat16", mode="sae", bias=0.0,
+                 row_block=None, centroid_block=None, cache_bytes=L2_BYTES):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.reference = encoder
+        self.fmt = fmt
+        self.mode = mode
+        self.bias = bias
+        auto_rows, auto_cents = tile_shape(DEFAULT_BATCH_SIZE, encoder.k, encoder.d,
+                                           np.dtype(np.float32).itemsize, cache_bytes)
+        self.row_block = row_block or auto_rows
+        self.block = block = centroid_block or auto_cents
+        self.q, self.scale = quantize(encoder.weights, fmt)
+
+        # Per-centroid quantization error ‖c_i − ĉ_i‖, and the bias each
+        # mode adds to the scores (kmeans bias uses the exact norms)
+        err = np.empty(encoder.k, dtype=np.float64)
+        for start in range(0, encoder.k, block):
+            stop = start + block
+            approx = dequantize(self.q[start:stop], self._scale(start, stop), fmt)
+            err[start:stop] = np.linalg.norm(approx - encoder.weights[start:stop], axis=1)
+        self.max_error = float(err.max()) if len(err) else 0.0
+        rank_bias = encoder.bias if mode == "kmeans" else np.broadcast_to(bias, (encoder.k,))
+        self.rank_bias = np.asarray(rank_bias, dtype=np.float32)
+        self.c_norm_max = float(np.max(encoder.norms)) if encoder.k else 0.0
+        self.last_stats = None
+
+    def _scale(self, start, stop):
+        return None if self.scale is None else self.scale[start:stop]
+
+    @property
+    def k(self):
+        return self.q.shape[0]
+
+    @property
+    def d(self):
+        return self.q.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.q.nbytes + (0 if self.scale is None else self.scale.nbytes)
+
+    def _approx_top2(self, x):
+        """Running (best index, best, second) over dequantized cache-sized tiles"""
+        n = x.shape[0]
+        best_idx = np.zeros(n, dtype=np.int64)
+        best = np.full(n, -np.inf, dtype=np.float32)
+        second = np.full(n, -np.inf, dtype=np.float32)
+        for r0 in range(0, n, self.row_block):
+            r1 = min(r0 + self.row_block, n)
+            xt = x[r0:r1]
+            rows = np.arange(r1 - r0)
+            for start in range(0, self.k, self.block):
+                stop = min(start + self.block, self.k)
+                w = dequantize(self.q[start:stop], self._scale(start, stop), self.fmt)
+                s = xt @ w.T
+                s += self.rank_bias[start:stop]
+                idx = s.argmax(axis=1)
+                top = s[rows, idx]
+                s[rows, idx] = -np.inf
+                if stop - start > 1:
+                    runner = s.max(axis=1)
+                else:
+                    runner = np.full(r1 - r0, -np.inf, dtype=np.float32)
+
+                t_best, t_second = best[r0:r1], second[r0:r1]
+                better = top > t_best
+                second[r0:r1] = np.where(better, np.maximum(t_best, runner),
+                                         np.maximum(t_second, top))
+                best_idx[r0:r1] = np.where(better, idx + start, best_idx[r0:r1])
+                best[r0:r1] = np.where(better, top, t_best)
+        return best_idx, best, second
+
+    def top1(self, x, batch_size=DEFAULT_BATCH_SIZE):
+        """(indices, values); indices match `reference.select(x, mode, bias)`,
+        values come from the quantized scores except on re-scored rows"""
+        x = _as_2d(x)
+        _check_dims(x, self.q)
+        n = x.shape[0]
+        indices = np.empty(n, dtype=np.int64)
+        values = np.empty(n, dtype=np.float32)
+        rescored = 0
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            chunk = np.asarray(x[start:stop], dtype=np.float32)
+            idx, best, second = self._approx_top2(chunk)
+
+            x_norm = np.linalg.norm(chunk, axis=1)
+            bound = x_norm * self.max_error
+            # float32 accumulation error of either path, ~d·eps·(‖x‖‖c‖ + |bias|)
+            bias_max = float(np.abs(self.rank_bias).max()) if self.k else 0.0
+            bound += self.d * np.finfo(np.float32).eps * (x_norm * self.c_norm_max + bias_max)
+            uncertain = best - second <= 2 * bound
+            if self.mode == "sae":
+                # ReLU clamps: the sign of the winner must be certain too
+                uncertain |= np.abs(best) <= bound
+
+            if self.mode == "sae":
+                val = np.maximum(best, 0)
+                idx[val == 0] = 0
+            else:
+                val = np.maximum(np.einsum("nd,nd->n", chunk, chunk) - 2 * best, 0)
+
+            if uncertain.any():
+                bad = np.nonzero(uncertain)[0]
+                idx[bad], val[bad] = self.reference.select(chunk[bad], mode=self.mode, bias=self.bias)
+                rescored += len(bad)
+            indices[start:stop] = idx
+            values[start:stop] = val
+
+        self.last_stats = {"rows": n, "rescored_rows": rescored, "format": self.fmt,
+                           "bytes": self.nbytes, "reference_bytes": self.reference.weights.nbytes}
+        return indices, values
+
+    __call__ = top1
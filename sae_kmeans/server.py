@@ -0,0 +1,249 @@
+"""
+Local assignment server with dynamic micro-batching
+
+Concept-aware decoding issues one small request per token. Each request
+handler thread hands its vector to a `MicroBatcher`, which waits at most
+`max_wait_ms` after the oldest pending request (or until `max_batch` rows
+are pending) and then runs one matmul + argmax for the whole batch.
+
+Endpoints (localhost HTTP):
+    POST /assign   body: d float32 values (application/octet-stream)
+                   or {"x": [...]} (application/json)
+                   -> {"index": i, "value": v}
+    GET  /stats    -> latency p50/p99 (ms) and batch-size histogram
+
+Usage:
+    python -m sae_kmeans.server encoder.saek --port 8765 --max-wait-ms 2
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .encoder import MODES
+from .store import open_encoder
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 100_000
+REQUEST_QUEUE_SIZE = 1024
+
+
+class _Request:
+    __slots__ = ("x", "start", "done", "index", "value", "error")
+
+    def __init__(self, x):
+        self.x = x
+        self.start = time.perf_counter()
+        self.done = threading.Event()
+        self.index = self.value = self.error = None
+
+
+class MicroBatcher:
+    """Coalesce single-row requests into batched top-1 calls on one thread"""
+
+    def __init__(self, encoder, mode="sae", bias=0.0, max_batch=DEFAULT_MAX_BATCH,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.encoder = encoder
+        self.mode = mode
+        self.bias = bias
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = Counter()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def check(self, x):
+        """x as a (d,) float32 vector; ValueError if it has the wrong size or is not finite"""
+        x = np.asarray(x, dtype=np.float32).ravel()
+        if x.shape[0] != self.encoder.d:
+            raise ValueError(f"expected {self.encoder.d} values, got {x.shape[0]}")
+        if not np.isfinite(x).all():
+            raise ValueError("input contains NaN or inf")
+        return x
+
+    def submit(self, x):
+        """Blocking top-1 for one (d,) vector -> (index, value)"""
+        request = _Request(self.check(x))
+        # Enqueue under the lock so nothing can land behind close()'s sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.index, request.value
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first.start + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                # Requeue the sentinel behind anything still pending so it is served first
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                indices, values = self.encoder.select(np.stack([r.x for r in batch]),
+                                                      mode=self.mode, bias=self.bias)
+                for r, i, v in zip(batch, indices, values):
+                    r.index, r.value = int(i), float(v)
+            except Exception as e:
+                for r in batch:
+                    r.error = e
+            end = time.perf_counter()
+            with self._lock:
+                self.batch_sizes[len(batch)] += 1
+                self.latencies.extend(end - r.start for r in batch)
+            for r in batch:
+                r.done.set()
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            sizes = dict(sorted(self.batch_sizes.items()))
+        served = sum(size * count for size, count in sizes.items())
+        return {
+            "requests": served,
+            "batches": sum(sizes.values()),
+            "mean_batch": served / max(1, sum(sizes.values())),
+            "latency_ms": {
+                "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+                "window": len(latencies),
+            },
+            "batch_histogram": {str(size): count for size, count in sizes.items()},
+        }
+
+    def close(self):
+        """Serve every request already submitted, then stop the worker"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+
+def make_handler(batcher):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive: every reply carries Content-Length
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, batcher.stats())
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                # The body cannot be skipped, so the connection cannot be reused
+                self.close_connection = True
+                self._reply(400, {"error": "invalid Content-Length"})
+                return
+            body = self.rfile.read(length)
+            if self.path != "/assign":
+                self._reply(404, {"error": f"unknown path {self.path}"})
+                return
+            try:
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    x = json.loads(body)["x"]
+                else:
+                    x = np.frombuffer(body, dtype="<f4")
+                x = batcher.check(x)
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": str(e)})
+                return
+            try:
+                index, value = batcher.submit(x)
+            except Exception as e:
+                # The batch itself failed; every request in it gets the error
+                self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._reply(200, {"index": index, "value": value})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops connections under a burst of clients
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+def serve(encoder, host="127.0.0.1", port=8765, **batcher_options):
+    """Run the HTTP server until interrupted"""
+    batcher = MicroBatcher(encoder, **batcher_options)
+    server = _Server((host, port), make_handler(batcher))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve top-1 assignment over localhost HTTP")
+    parser.add_argument("encoder", help="saved encoder file or (k, d) .npy centroid matrix")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=MODES, default="sae")
+    parser.add_argument("--bias", type=float, default=0.0)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    encoder = open_encoder(args.encoder)
+    print(f"serving {encoder} on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        serve(encoder, host=args.host, port=args.port, mode=args.mode, bias=args.bias,
+              max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
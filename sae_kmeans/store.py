@@ -0,0 +1,126 @@
+"""
+Versioned, memory-mappable encoder store
+
+Layout (little-endian):
+
+    magic   8 bytes  b"SAEKENC\\0"
+    version u32
+    length  u32      byte length of the JSON header that follows
+    header  JSON     k, d, normalized and {name: [dtype, offset, nbytes]}
+    ...     padding to ALIGNMENT
+    weights (k, d)   at a page-aligned offset
+    norms   (k,)     page-aligned
+    bias    (k,)     page-aligned
+
+Loading maps the file read-only and wraps each section with np.frombuffer:
+no parsing, no copies and no norm/bias recomputation, so cold start costs a
+few page faults regardless of dictionary size. The mapping is shared, so
+worker processes opening the same file share its physical pages, and each
+array starts on a page boundary for GEMM.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from .encoder import CentroidEncoder
+
+MAGIC = b"SAEKENC\0"
+VERSION = 1
+ALIGNMENT = max(mmap.PAGESIZE, 4096)
+SECTIONS = ("weights", "norms", "bias")
+_PREFIX = struct.Struct("<8sII")
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_encoder(path, encoder):
+    """Write encoder (weights, norms, bias, normalized flag) to path atomically"""
+    arrays = {
+        "weights": np.ascontiguousarray(encoder.weights),
+        "norms": np.ascontiguousarray(np.broadcast_to(encoder.norms, (encoder.k,))),
+        "bias": np.ascontiguousarray(np.broadcast_to(encoder.bias, (encoder.k,))),
+    }
+    for name, arr in arrays.items():
+        if arr.dtype.byteorder == ">":
+            arrays[name] = arr.astype(arr.dtype.newbyteorder("<"))
+
+    # Offsets depend on the header length; a generous fixed header slot keeps
+    # them independent of the JSON size
+    sections = {}
+    offset = ALIGNMENT
+    for name in SECTIONS:
+        arr = arrays[name]
+        sections[name] = [arr.dtype.str, offset, arr.nbytes]
+        offset = _align(offset + arr.nbytes)
+    header = json.dumps({
+        "k": encoder.k,
+        "d": encoder.d,
+        "normalized": bool(encoder.normalized),
+        "sections": sections,
+    }).encode()
+    if _PREFIX.size + len(header) > ALIGNMENT:
+        raise ValueError(f"header of {len(header)} bytes does not fit before the first section")
+
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name in SECTIONS:
+            f.seek(sections[name][1])
+            f.write(arrays[name].tobytes())
+        f.truncate(_align(f.tell()))
+    os.replace(tmp, path)
+    return path
+
+
+def read_header(path):
+    """Header dict of an encoder file; raises ValueError for other files/versions"""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is not an encoder file (too short)")
+        magic, version, length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an encoder file (bad magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"{path} has format version {version}, expected {VERSION}")
+        return json.loads(f.read(length))
+
+
+def is_encoder_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_encoder(path, mmap_mode=True):
+    """CentroidEncoder backed by the file's pages (mmap_mode) or an in-memory copy"""
+    header = read_header(path)
+    with open(path, "rb") as f:
+        if mmap_mode:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = f.read()
+
+    arrays = {}
+    for name in SECTIONS:
+        dtype, offset, nbytes = header["sections"][name]
+        dtype = np.dtype(dtype)
+        arrays[name] = np.frombuffer(buf, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset)
+    weights = arrays["weights"].reshape(header["k"], header["d"])
+    return CentroidEncoder(weights, norms=arrays["norms"], bias=arrays["bias"],
+                           normalized=header["normalized"])
+
+
+def open_encoder(path):
+    """Load a saved encoder file, or wrap a (k, d) .npy matrix (memory-mapped)"""
+    if is_encoder_file(path):
+        return load_encoder(path)
+    return CentroidEncoder(np.load(path, mmap_mode="r"))
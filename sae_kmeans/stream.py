@@ -0,0 +1,161 @@
+"""
+Out-of-core streaming assignment
+
+Activation dumps are memory-mapped `.npy` files of shape (N, d), usually
+float16 and far larger than RAM. Rows are processed in fixed-size chunks
+sized from a working-set budget; results go to memory-mapped `.npy` outputs
+and consumed pages are handed back to the kernel, so peak RSS is bounded by
+the budget rather than the file size.
+
+Usage:
+    python -m sae_kmeans.stream centroids.npy dump_000.npy dump_001.npy \\
+        --out-dir assignments/ --max-rss 2GiB
+"""
+
+import argparse
+import mmap
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .encoder import MODES
+from .store import open_encoder
+
+DEFAULT_MAX_RSS = 1 << 30
+PAGE_SIZE = mmap.PAGESIZE
+
+
+def rows_for_budget(encoder, d_itemsize, max_rss_bytes):
+    """Largest chunk whose working set fits in max_rss_bytes
+
+    Fixed cost is the encoder itself; per row we hold the mapped input row,
+    its float32 upcast, the (k,) score row and the two outputs.
+    """
+    fixed = sum(np.asarray(a).nbytes for a in (encoder.weights, encoder.bias, encoder.norms))
+    if encoder.weights.dtype.itemsize < 4:
+        # half-precision weights are upcast per chunk
+        fixed += encoder.k * encoder.d * 4
+    per_row = encoder.d * (d_itemsize + 4) + encoder.k * 4 + 8 + 4
+    available = max_rss_bytes - fixed
+    if available < per_row:
+        raise ValueError(
+            f"max_rss_bytes={max_rss_bytes} cannot hold the encoder ({fixed} bytes) "
+            f"plus one row ({per_row} bytes)"
+        )
+    return int(available // per_row)
+
+
+def _release(arr, stop_byte, released):
+    """MADV_DONTNEED the pages of a memmap below stop_byte; returns new mark"""
+    mm = getattr(arr, "_mmap", None)
+    if mm is None or not hasattr(mm, "madvise") or not hasattr(mmap, "MADV_DONTNEED"):
+        return released
+    # np.memmap maps from an allocation-granularity boundary below its offset
+    lead = arr.offset % mmap.ALLOCATIONGRANULARITY
+    end = (lead + stop_byte) // PAGE_SIZE * PAGE_SIZE
+    if end > released:
+        mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+        return end
+    return released
+
+
+def assign_file(in_path, encoder, out_prefix, mode="sae", bias=0.0, chunk_rows=None,
+                max_rss_bytes=DEFAULT_MAX_RSS):
+    """Assign every row of a (N, d) `.npy` file, writing results to disk
+
+    Writes `<out_prefix>.indices.npy` (int32/int64) and
+    `<out_prefix>.values.npy` (float32). In "sae" mode values are the top-1
+    activations ReLU(⟨w_i, x⟩ + bias); in "kmeans" mode they are the
+    squared distances to the assigned centroid. Returns throughput stats.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    x = np.load(in_path, mmap_mode="r")
+    if x.ndim != 2 or x.shape[1] != encoder.d:
+        raise ValueError(f"{in_path}: expected shape (N, {encoder.d}), got {x.shape}")
+    n = x.shape[0]
+
+    if chunk_rows is None:
+        chunk_rows = rows_for_budget(encoder, x.dtype.itemsize, max_rss_bytes)
+    chunk_rows = max(1, min(chunk_rows, n))
+
+    out_prefix = str(out_prefix)
+    index_dtype = np.int32 if encoder.k <= np.iinfo(np.int32).max else np.int64
+    indices = open_memmap(out_prefix + ".indices.npy", mode="w+", dtype=index_dtype, shape=(n,))
+    values = open_memmap(out_prefix + ".values.npy", mode="w+", dtype=np.float32, shape=(n,))
+
+    row_bytes = x.shape[1] * x.dtype.itemsize
+    released = {"x": 0, "indices": 0, "values": 0}
+    start_time = time.perf_counter()
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        chunk = np.asarray(x[start:stop], dtype=np.float32)
+
+        idx, val = encoder.select(chunk, mode=mode, bias=bias)
+        indices[start:stop] = idx
+        values[start:stop] = val
+        del chunk
+
+        indices.flush()
+        values.flush()
+        released["x"] = _release(x, stop * row_bytes, released["x"])
+        released["indices"] = _release(indices, stop * indices.itemsize, released["indices"])
+        released["values"] = _release(values, stop * values.itemsize, released["values"])
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        "path": str(in_path),
+        "rows": n,
+        "chunk_rows": chunk_rows,
+        "seconds": elapsed,
+        "rows_per_s": n / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def assign_files(in_paths, encoder, out_dir, **kwargs):
+    """Stream several dumps; outputs are named after each input file"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        assign_file(path, encoder, out_dir / Path(path).stem, **kwargs)
+        for path in in_paths
+    ]
+
+
+def parse_size(text):
+    """'512MiB', '2G', '1000000' -> bytes"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(i?B?)\s*", text, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+    number, unit, suffix = match.groups()
+    base = 1024 if suffix.lower().startswith("i") or not suffix else 1000
+    return int(float(number) * base ** " KMGT".index(unit.upper() or " "))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream (N, d) .npy dumps through top-1 assignment")
+    parser.add_argument("centroids", type=Path,
+                        help="(k, d) .npy centroid matrix or a saved encoder file")
+    parser.add_argument("inputs", type=Path, nargs="+")
+    parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--mode", choices=MODES, default="sae")
+    parser.add_argument("--bias", type=float, default=0.0)
+    parser.add_argument("--chunk-rows", type=int)
+    parser.add_argument("--max-rss", type=parse_size, default=DEFAULT_MAX_RSS)
+    args = parser.parse_args(argv)
+
+    encoder = open_encoder(args.centroids)
+    for stats in assign_files(args.inputs, encoder, args.out_dir, mode=args.mode,
+                              bias=args.bias, chunk_rows=args.chunk_rows,
+                              max_rss_bytes=args.max_rss):
+        print(f"{stats['path']}: {stats['rows']} rows in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_s']:.3g} rows/s, chunk={stats['chunk_rows']})",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Online mini-batch k-means and batch Lloyd iterations
+
+Batches are consumed one at a time (Sculley 2010): each centroid keeps a
+running count and moves toward the mean of its newly assigned rows with
+step size batch_count / total_count. With `normalize=True` centroids are
+projected back to the unit sphere after every step, so the exported
+encoder always satisfies `h_normalized` and its SAE top-1 equals k-means.
+
+`lloyd_history` runs full-batch Lloyd iterations and keeps every state, so
+convergence can be replayed (e.g. animated) without recomputing anything.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from .assign import _as_2d, _result_dtype, cluster_sums, normalize as _normalize
+from .encoder import CentroidEncoder
+
+
+def _checkpoint_path(path):
+    # np.savez appends .npz to any other name; load must look in the same place
+    path = Path(path)
+    return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+
+def kmeans_plusplus(x, k, rng):
+    """k-means++ seeding: k rows of x, each drawn ∝ squared distance to the chosen set"""
+    x = _as_2d(x)
+    n = x.shape[0]
+    chosen = np.empty(k, dtype=np.int64)
+    chosen[0] = rng.integers(n)
+    diff = x - x[chosen[0]]
+    closest = np.einsum("nd,nd->n", diff, diff).astype(np.float64)
+    for i in range(1, k):
+        total = closest.sum()
+        chosen[i] = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        diff = x - x[chosen[i]]
+        np.minimum(closest, np.einsum("nd,nd->n", diff, diff), out=closest)
+    return x[chosen].copy()
+
+
+def lloyd_history(x, centroids, iters=20, normalize=False, tol=0.0):
+    """Lloyd's algorithm from `centroids`, keeping every intermediate state
+
+    Returns (centroids (T+1, k, d), labels (T, n), inertia (T,)) where step t
+    assigns with centroids[t] and updates to centroids[t + 1]. Each step is
+    one batched assignment plus `cluster_sums`; empty clusters keep their
+    centroid. Stops early once no centroid moves more than tol.
+    """
+    x = _as_2d(x)
+    c = np.array(centroids, dtype=_result_dtype(x, np.asarray(centroids)))
+    if normalize:
+        c = _normalize(c)
+    k = c.shape[0]
+    states, labels_seen, inertia = [c], [], []
+    for _ in range(iters):
+        labels, sq_dists = CentroidEncoder(c).nearest(x)
+        sums, counts = cluster_sums(x, labels, k)
+        hit = counts > 0
+        new = c.copy()
+        new[hit] = sums[hit] / counts[hit, None]
+        if normalize:
+            new = _normalize(new)
+        states.append(new)
+        labels_seen.append(labels)
+        inertia.append(float(sq_dists.sum()))
+        moved = np.abs(new - c).max()
+        c = new
+        if moved <= tol:
+            break
+    return np.stack(states), np.stack(labels_seen), np.array(inertia)
+
+
+class MiniBatchKMeans:
+    """Streaming k-means trainer that exports a CentroidEncoder
+
+    Call `partial_fit` with each new batch; training can resume at any time
+    from the current centroids and counts, no restart on new data.
+    """
+
+    def __init__(self, k, normalize=True, seed=0):
+        self.k = k
+        self.normalize = normalize
+        self.rng = np.random.default_rng(seed)
+        self.centroids = None
+        self.counts = np.zeros(k, dtype=np.int64)
+        self.batches_seen = 0
+        self.last_inertia = None
+        self._pending = []
+
+    def _init(self, x):
+        # Buffer until there are enough rows to seed k centroids
+        self._pending.append(x)
+        pooled = np.concatenate(self._pending)
+        if pooled.shape[0] < self.k:
+            return None
+        self._pending = []
+        centroids = kmeans_plusplus(pooled, self.k, self.rng).astype(_result_dtype(pooled, pooled))
+        self.centroids = _normalize(centroids) if self.normalize else centroids
+        return pooled
+
+    def partial_fit(self, x):
+        """Update centroids from one (n, d) batch"""
+        x = _as_2d(x)
+        if self.centroids is None:
+            x = self._init(x)
+            if x is None:
+                return self
+
+        labels, sq_dists = CentroidEncoder(self.centroids).nearest(x)
+        sums, batch_counts = cluster_sums(x, labels, self.k)
+        self.counts += batch_counts
+        hit = batch_counts > 0
+        # c ← c + (Σx − n_b c) / n_total, i.e. step size n_b / n_total toward the batch mean
+        self.centroids[hit] += (
+            sums[hit] - batch_counts[hit, None] * self.centroids[hit]
+        ) / self.counts[hit, None]
+        if self.normalize:
+            self.centroids = _normalize(self.centroids)
+
+        self.batches_seen += 1
+        self.last_inertia = float(sq_dists.sum())
+        return self
+
+    def fit(self, batches):
+        """Consume an iterable of batches"""
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    def to_encoder(self):
+        """Snapshot of the current centroids as an encoder for top-1 assignment"""
+        if self.centroids is None:
+            raise ValueError("trainer has not seen enough rows to initialize centroids")
+        return CentroidEncoder(self.centroids.copy(), normalized=self.normalize or None)
+
+    def save(self, path):
+        """Checkpoint centroids and counts so training can resume later
+
+        Written to path with ".npz" appended unless it already ends in it;
+        returns the path written.
+        """
+        if self.centroids is None:
+            raise ValueError("nothing to save before centroids are initialized")
+        path = _checkpoint_path(path)
+        np.savez(path, centroids=self.centroids, counts=self.counts,
+                 batches_seen=self.batches_seen, normalize=self.normalize)
+        return path
+
+    @classmethod
+    def load(cls, path, seed=0):
+        """Trainer resumed from a `save` checkpoint (same path, with or without .npz)"""
+        with np.load(_checkpoint_path(path)) as state:
+            trainer = cls(len(state["counts"]), normalize=bool(state["normalize"]), seed=seed)
+            trainer.centroids = state["centroids"]
+            trainer.counts = state["counts"]
+            trainer.batches_seen = int(state["batches_seen"])
+        return trainer
@@ -0,0 +1,31 @@
+"""
+Shared problem generators for the engine tests
+"""
+
+import numpy as np
+
+from sae_kmeans import normalize
+from sae_kmeans.blocked import direct_distances
+
+
+def unit_problem(n=2000, k=64, d=32, seed=0):
+    """Unit-norm centroids and points near them, so max activation > 0"""
+    rng = np.random.default_rng(seed)
+    centroids = normalize(rng.standard_normal((k, d)).astype(np.float32))
+    x = centroids[rng.integers(k, size=n)] + 0.3 * rng.standard_normal((n, d)).astype(np.float32)
+    return x.astype(np.float32), centroids
+
+
+def near_ties(centroids, n=500, offset=0.0, jitter=1e-6, seed=1):
+    """Points within jitter of the midpoint of two centroids, shifted by offset"""
+    rng = np.random.default_rng(seed)
+    k, d = centroids.shape
+    a, b = rng.integers(k, size=n), rng.integers(k, size=n)
+    mid = 0.5 * (centroids[a].astype(np.float64) + centroids[b])
+    x = mid + jitter * rng.standard_normal((n, d)) + offset
+    return x.astype(np.float32), centroids + np.float32(offset)
+
+
+def brute_nearest(x, centroids):
+    """argmin ‖x − c_i‖² from explicit float64 differences"""
+    return direct_distances(x, centroids).argmin(axis=1)
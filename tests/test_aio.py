@@ -0,0 +1,24 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from sae_kmeans import AsyncAssigner, CentroidEncoder, sae_top1
+
+from helpers import unit_problem
+
+
+def test_async_close_serves_queued_requests():
+    x, centroids = unit_problem(n=64)
+    encoder = CentroidEncoder(centroids)
+
+    async def run():
+        assigner = AsyncAssigner(encoder, max_batch=8)
+        tasks = [asyncio.ensure_future(assigner.assign(row)) for row in x]
+        await asyncio.sleep(0)
+        await assigner.aclose()
+        with pytest.raises(RuntimeError):
+            await assigner.assign(x[0])
+        return [task.result()[0] for task in tasks]
+
+    np.testing.assert_array_equal(asyncio.run(run()), sae_top1(x, centroids)[0])
@@ -0,0 +1,34 @@
+import numpy as np
+
+from sae_kmeans import kmeans_assign, normalize, sae_top1, sae_topk
+
+from helpers import unit_problem
+
+
+def test_sae_top1_matches_kmeans_on_unit_norm_centroids():
+    x, centroids = unit_problem()
+    _, values = sae_top1(x, centroids)
+    assert (values > 0).all()
+    np.testing.assert_array_equal(sae_top1(x, centroids, batch_size=97)[0],
+                                  kmeans_assign(x, centroids))
+
+
+def test_normalize_accepts_lists():
+    # The scene module builds its demo centroids from a list of tuples
+    centroids = normalize([(1, 0), (-0.5, 0.866), (-0.5, -0.866)])
+    assert centroids.shape == (3, 2)
+    np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1, rtol=1e-6)
+
+
+def test_topk_column_zero_matches_top1_with_ties():
+    # Integer-valued scores make many exact ties, including at the TopK cut
+    rng = np.random.default_rng(2)
+    weights = np.eye(16, dtype=np.float32)
+    x = rng.integers(-2, 4, size=(500, 16)).astype(np.float32)
+    top1_idx, _ = sae_top1(x, weights)
+    for top_k in (1, 3, 8):
+        indices, values = sae_topk(x, weights, top_k)
+        np.testing.assert_array_equal(indices[:, 0], top1_idx)
+        assert (np.diff(values, axis=1) <= 0).all()
+        ref = np.lexsort((np.arange(16)[None, :].repeat(len(x), 0), -np.maximum(x, 0)), axis=1)
+        np.testing.assert_array_equal(indices, ref[:, :top_k])
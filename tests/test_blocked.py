@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import blocked_nearest
+from sae_kmeans.blocked import direct_distances
+
+from helpers import brute_nearest, near_ties, unit_problem
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e3])
+def test_blocked_nearest_matches_brute_force_near_ties(offset):
+    _, centroids = unit_problem(k=64)
+    x, centroids = near_ties(centroids, offset=offset)
+    indices, sq_dists, corrected = blocked_nearest(x, centroids, row_block=64, centroid_block=16)
+    np.testing.assert_array_equal(indices, brute_nearest(x, centroids))
+    np.testing.assert_allclose(sq_dists, direct_distances(x, centroids).min(axis=1),
+                               rtol=1e-5, atol=1e-6)
+    assert corrected.any()
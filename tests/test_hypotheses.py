@@ -0,0 +1,15 @@
+import numpy as np
+
+from sae_kmeans import CentroidEncoder, CheckedAssigner
+
+from helpers import brute_nearest, near_ties, unit_problem
+
+
+def test_checked_assigner_matches_brute_force_near_ties():
+    _, centroids = unit_problem(k=64)
+    x, _ = near_ties(centroids)
+    checker = CheckedAssigner(CentroidEncoder(centroids))
+    assert checker.fast_path
+    indices, fallback = checker(x)
+    np.testing.assert_array_equal(indices, brute_nearest(x, centroids))
+    assert fallback.any()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, IVFIndex
+
+from helpers import unit_problem
+
+
+@pytest.mark.parametrize("mode", ["sae", "kmeans"])
+def test_full_probe_is_brute_force(mode):
+    x, centroids = unit_problem(n=1000, k=256)
+    encoder = CentroidEncoder(centroids)
+    index = IVFIndex(encoder, n_lists=16, mode=mode)
+    indices, values = index.search(x, n_probe=16)
+    expected = encoder.select(x, mode=mode)
+    np.testing.assert_array_equal(indices, expected[0])
+    np.testing.assert_allclose(values, expected[1], rtol=1e-5, atol=1e-6)
+    assert (index.last_candidates == encoder.k).all()
+
+
+def test_recall_grows_with_n_probe():
+    x, centroids = unit_problem(n=1000, k=256)
+    index = IVFIndex(CentroidEncoder(centroids), n_lists=16)
+    reports = [index.agreement(x, n_probe=p) for p in (1, 4, 16)]
+    agreement = [r["agreement"] for r in reports]
+    assert agreement == sorted(agreement) and agreement[-1] == 1.0
+    assert reports[0]["candidate_fraction"] < reports[1]["candidate_fraction"] < 1.0 + 1e-12
+
+
+def test_buckets_partition_the_encoder():
+    _, centroids = unit_problem(k=100)
+    index = IVFIndex(CentroidEncoder(centroids), n_lists=10)
+    np.testing.assert_array_equal(np.sort(index.order), np.arange(100))
+    assert index.offsets[-1] == 100
+    np.testing.assert_allclose(np.linalg.norm(index.centers, axis=1), 1, rtol=1e-5)
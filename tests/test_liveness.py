@@ -0,0 +1,54 @@
+import numpy as np
+
+from sae_kmeans import CentroidEncoder, LiveNeuronTracker, kmeans_assign
+
+from helpers import brute_nearest, unit_problem
+
+
+def tracked(k=32, live=(0, 3, 4, 10, 31)):
+    """Tracker where only `live` latents have ever won"""
+    tracker = LiveNeuronTracker(k)
+    tracker.update(np.repeat(np.array(live), 5))
+    return tracker, np.array(live)
+
+
+def test_live_mask_and_horizon():
+    tracker, live = tracked()
+    assert tracker.live_count == len(live)
+    np.testing.assert_array_equal(np.nonzero(tracker.live_mask())[0], live)
+    # Only latent 7 wins afterwards; a short horizon forgets the others
+    tracker.update(np.full(100, 7))
+    np.testing.assert_array_equal(np.nonzero(tracker.live_mask(horizon=50))[0], [7])
+    # Masked rows are not counted
+    tracker.update(np.array([1, 2]), active=np.array([True, False]))
+    assert tracker.counts[1] == 1 and tracker.counts[2] == 0
+
+
+def test_prune_drops_dead_latents():
+    _, centroids = unit_problem(k=32)
+    encoder = CentroidEncoder(centroids)
+    tracker, live = tracked()
+    pruned, remap = tracker.prune(encoder)
+    assert pruned.k == len(live)
+    np.testing.assert_array_equal(pruned.weights, centroids[live])
+    np.testing.assert_array_equal(remap[live], np.arange(len(live)))
+    assert (np.delete(remap, live) == -1).all()
+    np.testing.assert_array_equal(tracker.counts, np.full(len(live), 5))
+
+
+def test_merge_remaps_dead_latents_to_nearest_live():
+    _, centroids = unit_problem(k=32)
+    encoder = CentroidEncoder(centroids)
+    tracker, live = tracked()
+    merged, remap = tracker.merge(encoder)
+    assert merged.k == len(live) and tracker.k == len(live)
+    np.testing.assert_array_equal(remap[live], np.arange(len(live)))
+    dead = np.setdiff1d(np.arange(32), live)
+    np.testing.assert_array_equal(remap[dead], brute_nearest(centroids[dead], centroids[live]))
+    # Wins are carried over, so the merged tracker still accounts for every row
+    assert tracker.counts.sum() == tracker.rows_seen
+
+    # Stored assignments stay valid: old winners map onto the merged encoder
+    x, _ = unit_problem(n=500, k=32)
+    old = kmeans_assign(x, centroids)
+    assert ((remap[old] >= 0) & (remap[old] < merged.k)).all()
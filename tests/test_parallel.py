@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, PartitionedAssigner, ShardedAssigner, merge_top1
+
+from helpers import unit_problem
+
+
+def test_select_is_batched_and_unchanged():
+    x, centroids = unit_problem(n=1000)
+    encoder = CentroidEncoder(centroids)
+    for mode in ("sae", "kmeans"):
+        whole = encoder.select(x, mode=mode)
+        blocks = encoder.select(x, mode=mode, batch_size=64)
+        np.testing.assert_array_equal(whole[0], blocks[0])
+        np.testing.assert_allclose(whole[1], blocks[1], rtol=1e-6)
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("mode", ["sae", "kmeans"])
+def test_sharded_matches_select(backend, mode):
+    x, centroids = unit_problem(n=3000)
+    encoder = CentroidEncoder(centroids)
+    with ShardedAssigner(encoder, workers=3, backend=backend, mode=mode,
+                         min_shard_rows=100) as assigner:
+        # Growing inputs make the process backend replace its shared blocks
+        for n in (500, 3000):
+            indices, values = assigner(x[:n])
+            expected = encoder.select(x[:n], mode=mode)
+            np.testing.assert_array_equal(indices, expected[0])
+            np.testing.assert_allclose(values, expected[1], rtol=1e-6)
+        assert sum(w["units"] for w in assigner.last_stats["per_worker"]) == 3000
+
+
+def test_sharded_input_buffer_slices():
+    x, centroids = unit_problem(n=1000)
+    encoder = CentroidEncoder(centroids)
+    expected = encoder.select(x)[0]
+    with ShardedAssigner(encoder, workers=2, backend="process", min_shard_rows=100) as assigner:
+        buf = assigner.input_buffer(x.shape, x.dtype)
+        buf[...] = x
+        np.testing.assert_array_equal(assigner(buf)[0], expected)
+        # Overlapping the start, disjoint from it, and strided
+        np.testing.assert_array_equal(assigner(buf[200:700])[0], expected[200:700])
+        np.testing.assert_array_equal(assigner(buf[600:])[0], expected[600:])
+        np.testing.assert_array_equal(assigner(buf[::3])[0], expected[::3])
+        # The caller's buffer is never overwritten
+        np.testing.assert_array_equal(buf, x)
+        del buf
+
+
+def test_merge_top1_matches_single_argmax():
+    rng = np.random.default_rng(3)
+    scores = rng.integers(0, 5, size=(300, 50)).astype(np.float32)
+    edges = [0, 7, 8, 30, 50]
+    partials = [(lo, scores[:, lo:hi].argmax(axis=1), scores[:, lo:hi].max(axis=1))
+                for lo, hi in zip(edges[:-1], edges[1:])]
+    indices, values = merge_top1(partials)
+    np.testing.assert_array_equal(indices, scores.argmax(axis=1))
+    np.testing.assert_array_equal(values, scores.max(axis=1))
+
+
+@pytest.mark.parametrize("mode", ["sae", "kmeans"])
+def test_partitioned_matches_unpartitioned(mode):
+    x, centroids = unit_problem(n=500, k=256)
+    encoder = CentroidEncoder(centroids)
+    with PartitionedAssigner(encoder, workers=2, blocks=5, mode=mode, min_block=1) as assigner:
+        indices, _ = assigner(x)
+    np.testing.assert_array_equal(indices, encoder.select(x, mode=mode)[0])
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_partitioned_accepts_per_latent_bias(backend):
+    x, centroids = unit_problem(n=300, k=256)
+    encoder = CentroidEncoder(centroids)
+    bias = np.random.default_rng(5).uniform(-0.5, 0.1, size=256).astype(np.float32)
+    with PartitionedAssigner(encoder, workers=2, blocks=5, backend=backend, bias=bias,
+                             min_block=1) as assigner:
+        indices, values = assigner(x)
+    expected = encoder.select(x, bias=bias)
+    np.testing.assert_array_equal(indices, expected[0])
+    np.testing.assert_allclose(values, expected[1], rtol=1e-6)
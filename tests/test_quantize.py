@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, QuantizedEncoder
+
+from helpers import near_ties, unit_problem
+
+
+@pytest.mark.parametrize("fmt", ["float16", "bfloat16", "int8"])
+@pytest.mark.parametrize("mode", ["sae", "kmeans"])
+def test_quantized_encoder_matches_reference_near_ties(fmt, mode):
+    _, centroids = unit_problem(k=300, d=48)
+    x, _ = near_ties(centroids, n=400, jitter=1e-3)
+    encoder = CentroidEncoder(centroids)
+    quantized = QuantizedEncoder(encoder, fmt=fmt, mode=mode, row_block=64, centroid_block=64)
+    indices, _ = quantized(x)
+    np.testing.assert_array_equal(indices, encoder.select(x, mode=mode)[0])
+    assert quantized.last_stats["rescored_rows"] > 0
@@ -0,0 +1,102 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, sae_top1
+from sae_kmeans.server import MicroBatcher, _Server, make_handler
+
+from helpers import unit_problem
+
+
+@pytest.fixture
+def problem():
+    x, centroids = unit_problem(n=400)
+    return x, CentroidEncoder(centroids), sae_top1(x, centroids)[0]
+
+
+def test_concurrent_submits_match_top1(problem):
+    x, encoder, expected = problem
+    batcher = MicroBatcher(encoder, max_batch=32, max_wait_ms=5)
+    try:
+        with ThreadPoolExecutor(16) as pool:
+            indices = [i for i, _ in pool.map(batcher.submit, x)]
+    finally:
+        batcher.close()
+    np.testing.assert_array_equal(indices, expected)
+    assert batcher.stats()["requests"] == len(x)
+    assert batcher.stats()["mean_batch"] > 1
+
+
+def test_check_rejects_bad_input(problem):
+    x, encoder, _ = problem
+    batcher = MicroBatcher(encoder)
+    try:
+        for bad in (x[0, :-1], np.full(encoder.d, np.nan), np.full(encoder.d, np.inf)):
+            with pytest.raises(ValueError):
+                batcher.submit(bad)
+    finally:
+        batcher.close()
+
+
+def test_close_serves_pending_then_rejects(problem):
+    x, encoder, expected = problem
+    # A long wait keeps every request pending until close() is called
+    batcher = MicroBatcher(encoder, max_batch=len(x) + 1, max_wait_ms=60_000)
+    results = [None] * len(x)
+
+    def submit(i):
+        results[i] = batcher.submit(x[i])[0]
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(x))]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    batcher.close()
+    for t in threads:
+        t.join(timeout=10)
+        assert not t.is_alive()
+    np.testing.assert_array_equal(results, expected)
+    with pytest.raises(RuntimeError):
+        batcher.submit(x[0])
+
+
+def test_http_keep_alive_round_trip(problem):
+    x, encoder, expected = problem
+    batcher = MicroBatcher(encoder)
+    server = _Server(("127.0.0.1", 0), make_handler(batcher))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+
+    def client(rows):
+        # One connection per client, reused across its requests
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        out = []
+        for row in rows:
+            conn.request("POST", "/assign", body=x[row].astype("<f4").tobytes(),
+                         headers={"Content-Type": "application/octet-stream"})
+            response = conn.getresponse()
+            assert response.status == 200
+            out.append(json.loads(response.read())["index"])
+        conn.request("POST", "/assign", body=json.dumps({"x": [float("nan")] * encoder.d}),
+                     headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        assert response.status == 400
+        response.read()
+        conn.close()
+        return out
+
+    try:
+        with ThreadPoolExecutor(32) as pool:
+            chunks = np.array_split(np.arange(len(x)), 32)
+            indices = np.concatenate(list(pool.map(client, chunks)))
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+    np.testing.assert_array_equal(indices, expected)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, load_encoder, save_encoder
+from sae_kmeans.store import read_header
+
+
+@pytest.mark.parametrize("mmap_mode", [True, False])
+def test_store_round_trip(tmp_path, mmap_mode):
+    rng = np.random.default_rng(4)
+    encoder = CentroidEncoder(rng.standard_normal((100, 24)).astype(np.float32))
+    path = save_encoder(tmp_path / "enc.saek", encoder)
+    loaded = load_encoder(path, mmap_mode=mmap_mode)
+    assert (loaded.k, loaded.d, loaded.normalized) == (encoder.k, encoder.d, encoder.normalized)
+    for name in ("weights", "norms", "bias"):
+        expected, actual = getattr(encoder, name), getattr(loaded, name)
+        assert actual.dtype == expected.dtype
+        np.testing.assert_array_equal(actual, expected)
+    x = rng.standard_normal((50, 24)).astype(np.float32)
+    np.testing.assert_array_equal(loaded.select(x, mode="kmeans")[0],
+                                  encoder.select(x, mode="kmeans")[0])
+
+
+def test_read_header_rejects_other_files(tmp_path):
+    path = tmp_path / "centroids.npy"
+    np.save(path, np.zeros((3, 2)))
+    with pytest.raises(ValueError):
+        read_header(path)
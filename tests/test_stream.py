@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import CentroidEncoder, assign_file, assign_files
+from sae_kmeans.stream import parse_size, rows_for_budget
+
+from helpers import unit_problem
+
+
+@pytest.mark.parametrize("mode", ["sae", "kmeans"])
+def test_assign_file_matches_select(tmp_path, mode):
+    x, centroids = unit_problem(n=1000)
+    np.save(tmp_path / "dump.npy", x.astype(np.float16))
+    encoder = CentroidEncoder(centroids)
+    stats = assign_file(tmp_path / "dump.npy", encoder, tmp_path / "out", mode=mode, chunk_rows=97)
+    assert stats["rows"] == 1000 and stats["chunk_rows"] == 97
+
+    expected = encoder.select(x.astype(np.float16).astype(np.float32), mode=mode)
+    np.testing.assert_array_equal(np.load(tmp_path / "out.indices.npy"), expected[0])
+    np.testing.assert_allclose(np.load(tmp_path / "out.values.npy"), expected[1], rtol=1e-6)
+
+
+def test_assign_files_names_outputs_after_inputs(tmp_path):
+    x, centroids = unit_problem(n=300)
+    encoder = CentroidEncoder(centroids)
+    paths = []
+    for i in range(2):
+        paths.append(tmp_path / f"dump_{i:03d}.npy")
+        np.save(paths[-1], x[i * 150:(i + 1) * 150])
+    # A budget this small forces many chunks
+    budget = sum(a.nbytes for a in (encoder.weights, encoder.bias, encoder.norms)) + 64 * 1024
+    assign_files(paths, encoder, tmp_path / "out", max_rss_bytes=budget)
+    for i, path in enumerate(paths):
+        indices = np.load(tmp_path / "out" / f"{path.stem}.indices.npy")
+        np.testing.assert_array_equal(indices, encoder.select(x[i * 150:(i + 1) * 150])[0])
+
+
+def test_budget_and_sizes():
+    _, centroids = unit_problem()
+    encoder = CentroidEncoder(centroids)
+    with pytest.raises(ValueError):
+        rows_for_budget(encoder, 2, 1024)
+    assert rows_for_budget(encoder, 2, 2 << 20) > rows_for_budget(encoder, 2, 1 << 20)
+    assert parse_size("2GiB") == 2 << 30
+    assert parse_size("512M") == 512 << 20
+    assert parse_size("512MB") == 512 * 10 ** 6
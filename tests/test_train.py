@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from sae_kmeans import MiniBatchKMeans, kmeans_assign, lloyd_history, normalize as normalize_rows
+
+from helpers import unit_problem
+
+
+def batches(x, size=250):
+    return [x[i:i + size] for i in range(0, len(x), size)]
+
+
+@pytest.mark.parametrize("name", ["ckpt", "ckpt.npz"])
+def test_checkpoint_resumes_training(tmp_path, name):
+    x, _ = unit_problem(n=2000, k=16)
+    parts = batches(x)
+    straight = MiniBatchKMeans(16, seed=3).fit(parts)
+
+    first = MiniBatchKMeans(16, seed=3).fit(parts[:4])
+    first.save(tmp_path / name)
+    resumed = MiniBatchKMeans.load(tmp_path / name).fit(parts[4:])
+
+    assert resumed.batches_seen == straight.batches_seen == len(parts)
+    np.testing.assert_array_equal(resumed.counts, straight.counts)
+    np.testing.assert_array_equal(resumed.centroids, straight.centroids)
+
+
+def test_trainer_exports_normalized_encoder():
+    x, centroids = unit_problem(n=4000, k=8)
+    trainer = MiniBatchKMeans(8, seed=0)
+    with pytest.raises(ValueError):
+        trainer.to_encoder()
+    # Fewer rows than k are buffered until seeding is possible
+    trainer.partial_fit(x[:5])
+    assert trainer.centroids is None
+    trainer.fit(batches(x[5:], 500))
+    assert trainer.counts.sum() == len(x)
+
+    encoder = trainer.to_encoder()
+    assert encoder.normalized
+    np.testing.assert_array_equal(encoder.top1(x)[0], kmeans_assign(x, encoder.weights))
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+def test_lloyd_history_replays_every_step(normalize):
+    x, centroids = unit_problem(n=1500, k=8)
+    start = centroids + 0.2
+    states, labels, inertia = lloyd_history(x, start, iters=6, normalize=normalize)
+    steps = len(inertia)
+    assert states.shape == (steps + 1, 8, x.shape[1]) and labels.shape == (steps, len(x))
+    np.testing.assert_allclose(states[0], normalize_rows(start) if normalize else start, rtol=1e-6)
+    for t in range(steps):
+        # Step t assigns with states[t] and moves each centroid to its cluster mean
+        np.testing.assert_array_equal(labels[t], kmeans_assign(x, states[t]))
+        for i in np.unique(labels[t]):
+            mean = x[labels[t] == i].mean(axis=0)
+            np.testing.assert_allclose(states[t + 1][i], normalize_rows(mean) if normalize else mean,
+                                       rtol=1e-4, atol=1e-5)
+    if not normalize:
+        # Without projection Lloyd's inertia never increases
+        assert (np.diff(inertia) <= 1e-3 * inertia[0]).all()
+
+
+def test_lloyd_history_stops_when_converged():
+    x, centroids = unit_problem(n=500, k=4)
+    _, _, inertia = lloyd_history(x, centroids, iters=100, tol=0.0)
+    assert len(inertia) < 100